@@ -3,11 +3,37 @@
 from __future__ import annotations
 
 import argparse
+import io
+import os
+import pickle
 import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
 
-from main import build_schema, convert_csv_to_yaml, derive_schema_path, write_schema
+from main import (
+    build_schema,
+    derive_schema_path,
+    read_csv_header,
+    stream_csv_to_yaml,
+    write_schema,
+)
+
+
+@dataclass
+class ConversionResult:
+    """Outcome of converting one file, with its log lines held for the caller to write."""
+    ok: bool
+    messages: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        """Truthy only on success, as the bool convert_file used to return."""
+        return self.ok
 
 
 def parse_args() -> argparse.Namespace:
@@ -38,6 +64,11 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Generate JSON Schema files alongside YAML files.",
     )
+    parser.add_argument(
+        "--schema-only",
+        action="store_true",
+        help="Only generate JSON Schema files from the CSV headers (no YAML output).",
+    )
     parser.add_argument(
         "--recursive",
         "-r",
@@ -49,19 +80,66 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Overwrite existing output files.",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only convert files whose outputs are missing or older than the input.",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
         help="Show what would be converted without actually converting.",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of parallel workers (default: 1, convert serially). Use 0 for one per CPU.",
+    )
+    parser.add_argument(
+        "--workers-mode",
+        choices=("process", "thread"),
+        default="process",
+        help="Run parallel conversions in worker processes or threads (default: process).",
+    )
     return parser.parse_args()
 
 
 def normalize_extension(ext: str) -> str:
     """Normalize extension to always start with a dot."""
-    if not ext.startswith("."):
-        return f".{ext.lower()}"
-    return ext.lower()
+    ext = ext.lower()
+    return ext if ext.startswith(".") else f".{ext}"
+
+
+def iter_files_by_extension(
+    folder: Path, extension: str, recursive: bool = False
+) -> Iterator[Path]:
+    """Yield files with the specified extension in the folder as they are found.
+    
+    Args:
+        folder: Directory to search in
+        extension: File extension to match (e.g., '.csv')
+        recursive: Whether to search subdirectories recursively
+    
+    Yields:
+        Matching file paths, in directory traversal order
+    """
+    extension = normalize_extension(extension)
+    
+    # os.scandir exposes the readdir file type, so only symlinks need an extra stat
+    pending = [folder]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if recursive and entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.endswith(extension) and entry.is_file():
+                    yield Path(entry.path)
 
 
 def find_files_by_extension(
@@ -77,18 +155,53 @@ def find_files_by_extension(
     Returns:
         List of matching file paths, sorted by name
     """
-    extension = normalize_extension(extension)
-    files: list[Path] = []
+    return sorted(iter_files_by_extension(folder, extension, recursive))
+
+
+def _stat_or_none(path: Path) -> os.stat_result | None:
+    """Return os.stat() for path, or None if it does not exist."""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _is_up_to_date(output_stat: os.stat_result | None, input_stat: os.stat_result) -> bool:
+    """Return True if an output exists and is at least as new as its input."""
+    return output_stat is not None and output_stat.st_mtime_ns >= input_stat.st_mtime_ns
+
+
+@lru_cache(maxsize=128)
+def _cached_schema(fieldnames: tuple[str, ...]) -> dict[str, object]:
+    """Build the schema once per distinct header; write_schema only reads it."""
+    return build_schema(fieldnames)
+
+
+def _write_header_schema(
+    input_file: Path,
+    schema_file: Path,
+    overwrite: bool,
+    dry_run: bool,
+    incremental: bool,
+) -> ConversionResult:
+    """Write only the JSON Schema for a CSV file, reading just its header row."""
+    if incremental:
+        input_stat = _stat_or_none(input_file)
+        if input_stat is not None and _is_up_to_date(_stat_or_none(schema_file), input_stat):
+            return ConversionResult(True, [f"  ⏭️  Up-to-date: {schema_file.name}"])
+    elif not overwrite and _stat_or_none(schema_file) is not None:
+        return ConversionResult(True, [f"  ⏭️  Skipped (Schema already exists): {schema_file.name}"])
     
-    if recursive:
-        pattern = f"**/*{extension}"
-        files = sorted(folder.glob(pattern))
-    else:
-        pattern = f"*{extension}"
-        files = sorted(folder.glob(pattern))
+    if dry_run:
+        return ConversionResult(True, [f"  📝 Would generate: {schema_file.name}"])
     
-    # Filter to only include files (not directories)
-    return [f for f in files if f.is_file()]
+    try:
+        write_schema(_cached_schema(tuple(read_csv_header(input_file))), schema_file)
+    except (FileNotFoundError, ValueError) as e:
+        return ConversionResult(False, errors=[f"  ✗ Error: {e}"])
+    except Exception as e:
+        return ConversionResult(False, errors=[f"  ✗ Unexpected error: {e}"])
+    return ConversionResult(True, [f"  ✓ Generated schema: {schema_file.name}"])
 
 
 def convert_file(
@@ -97,7 +210,9 @@ def convert_file(
     generate_schema: bool = True,
     overwrite: bool = False,
     dry_run: bool = False,
-) -> bool:
+    incremental: bool = False,
+    schema_only: bool = False,
+) -> ConversionResult:
     """Convert a single CSV file to YAML (and optionally schema).
     
     Args:
@@ -106,51 +221,184 @@ def convert_file(
         generate_schema: Whether to generate a JSON Schema file
         overwrite: Whether to overwrite existing files
         dry_run: If True, only print what would be done
+        incremental: If True, skip files whose outputs are newer than the input
+            and rebuild stale outputs even without overwrite
+        schema_only: If True, only write the schema, reading just the header row
     
     Returns:
-        True if conversion was successful (or would be in dry-run mode), False otherwise
+        ConversionResult whose ok flag is True if conversion was successful
+        (or would be in dry-run mode); log lines are returned rather than printed
     """
     # Determine output file paths
     yaml_file = output_dir / f"{input_file.stem}.yaml"
     schema_file = output_dir / f"{input_file.stem}.schema.json"
     
-    # Check if files already exist
-    if yaml_file.exists() and not overwrite:
-        print(f"  ⏭️  Skipped (YAML already exists): {yaml_file.name}")
-        return True
+    if schema_only:
+        return _write_header_schema(input_file, schema_file, overwrite, dry_run, incremental)
+    
+    if incremental:
+        input_stat = _stat_or_none(input_file)
+        if input_stat is not None and _is_up_to_date(_stat_or_none(yaml_file), input_stat) and (
+            not generate_schema or _is_up_to_date(_stat_or_none(schema_file), input_stat)
+        ):
+            return ConversionResult(True, [f"  ⏭️  Up-to-date: {yaml_file.name}"])
+    # Check if files already exist (one stat per output file)
+    elif not overwrite:
+        if _stat_or_none(yaml_file) is not None:
+            return ConversionResult(True, [f"  ⏭️  Skipped (YAML already exists): {yaml_file.name}"])
+        
+        if generate_schema and _stat_or_none(schema_file) is not None:
+            return ConversionResult(True, [f"  ⏭️  Skipped (Schema already exists): {schema_file.name}"])
     
-    if schema_file.exists() and generate_schema and not overwrite:
-        print(f"  ⏭️  Skipped (Schema already exists): {schema_file.name}")
-        return True
+    result = ConversionResult(True)
     
     if dry_run:
-        print(f"  📝 Would convert: {input_file.name} -> {yaml_file.name}")
+        result.messages.append(f"  📝 Would convert: {input_file.name} -> {yaml_file.name}")
         if generate_schema:
-            print(f"  📝 Would generate: {schema_file.name}")
-        return True
+            result.messages.append(f"  📝 Would generate: {schema_file.name}")
+        return result
     
     try:
         # Convert CSV to YAML
-        rows, fieldnames = convert_csv_to_yaml(input_file, yaml_file)
-        print(f"  ✓ Converted: {yaml_file.name} ({len(rows)} rows)")
+        row_count, fieldnames = stream_csv_to_yaml(input_file, yaml_file)
+        result.messages.append(f"  ✓ Converted: {yaml_file.name} ({row_count} rows)")
         
         # Generate schema if requested
         if generate_schema:
-            schema = build_schema(fieldnames)
+            schema = _cached_schema(tuple(fieldnames))
             write_schema(schema, schema_file)
-            print(f"  ✓ Generated schema: {schema_file.name}")
-        
-        return True
+            result.messages.append(f"  ✓ Generated schema: {schema_file.name}")
     
     except FileNotFoundError as e:
-        print(f"  ✗ Error: {e}", file=sys.stderr)
-        return False
+        result.ok = False
+        result.errors.append(f"  ✗ Error: {e}")
     except ValueError as e:
-        print(f"  ✗ Error: {e}", file=sys.stderr)
-        return False
+        result.ok = False
+        result.errors.append(f"  ✗ Error: {e}")
     except Exception as e:
-        print(f"  ✗ Unexpected error: {e}", file=sys.stderr)
-        return False
+        result.ok = False
+        result.errors.append(f"  ✗ Unexpected error: {e}")
+    
+    return result
+
+
+def _run_convert_func(
+    file_path: Path,
+    convert_func: Callable,
+    output_dir: Path,
+    generate_schema: bool,
+    overwrite: bool,
+    dry_run: bool,
+) -> ConversionResult:
+    """Run a custom convert function, capturing anything it prints."""
+    out = io.StringIO()
+    err = io.StringIO()
+    with redirect_stdout(out), redirect_stderr(err):
+        ok = bool(convert_func(file_path, output_dir, generate_schema, overwrite, dry_run))
+    return ConversionResult(ok, out.getvalue().splitlines(), err.getvalue().splitlines())
+
+
+def _report(progress: str, file_path: Path, result: ConversionResult) -> None:
+    """Write one file's progress line and log in a single write per stream."""
+    lines = [f"{progress} {file_path.name}", *result.messages, ""]
+    if result.errors:
+        sys.stdout.write("\n".join(lines))
+        sys.stdout.flush()
+        sys.stderr.write("\n".join(result.errors) + "\n")
+        sys.stderr.flush()
+        lines = [""]
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def _collect_files(
+    folder: Path,
+    extension: str,
+    output_dir: Path | None,
+    recursive: bool,
+    dry_run: bool,
+) -> tuple[list[Path], Path]:
+    """Find the files to convert, print the batch banner and return (files, output_dir)."""
+    if not folder.is_dir():
+        raise NotADirectoryError(f"Folder not found: {folder}")
+    
+    # Determine output directory
+    if output_dir is None:
+        output_dir = folder
+    else:
+        output_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Find matching files
+    extension = normalize_extension(extension)
+    files = find_files_by_extension(folder, extension, recursive)
+    
+    if not files:
+        print(f"No {extension} files found in {folder}")
+        if recursive:
+            print("(including subdirectories)")
+        return files, output_dir
+    
+    print(f"Found {len(files)} {extension} file(s) to process")
+    if dry_run:
+        print("DRY RUN MODE - No files will be modified")
+    print()
+    return files, output_dir
+
+
+def _run_batch(
+    files: list[Path],
+    task: Callable[..., ConversionResult],
+    task_args: tuple,
+    jobs: int | None,
+    executor_cls: type[ProcessPoolExecutor] | type[ThreadPoolExecutor],
+) -> int:
+    """Run task(file_path, *task_args) for every file and return the success count."""
+    success_count = 0
+    total_count = len(files)
+    
+    workers = min(jobs or os.cpu_count() or 1, total_count)
+    
+    if workers <= 1:
+        for i, file_path in enumerate(files, 1):
+            try:
+                result = task(file_path, *task_args)
+            except Exception as e:
+                result = ConversionResult(False, errors=[f"  ✗ Error: {e}"])
+            _report(f"[{i}/{total_count}] Processing:", file_path, result)
+            if result.ok:
+                success_count += 1
+        return success_count
+    
+    # Conversions are independent, so fan them out across workers. Workers
+    # return their log lines instead of printing, so only the parent writes output.
+    # Files are reported as they finish, so the progress line counts finished
+    # files rather than numbering them in input order.
+    # Only a couple of files per worker are queued at once, so huge batches don't
+    # hold a pending future (and its pickled arguments) for every file.
+    remaining = iter(files)
+    completed = 0
+    with executor_cls(max_workers=workers) as executor:
+        futures = {}
+        for file_path in islice(remaining, 2 * workers):
+            futures[executor.submit(task, file_path, *task_args)] = file_path
+        
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                file_path = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = ConversionResult(False, errors=[f"  ✗ Error: {e}"])
+                completed += 1
+                _report(f"[{completed}/{total_count} done]", file_path, result)
+                if result.ok:
+                    success_count += 1
+                next_file = next(remaining, None)
+                if next_file is not None:
+                    futures[executor.submit(task, next_file, *task_args)] = next_file
+    
+    return success_count
 
 
 def batch_convert(
@@ -161,9 +409,12 @@ def batch_convert(
     recursive: bool = False,
     overwrite: bool = False,
     dry_run: bool = False,
-    convert_func: Callable | None = None,
+    jobs: int | None = 1,
+    incremental: bool = False,
+    schema_only: bool = False,
+    workers_mode: str = "process",
 ) -> tuple[int, int]:
-    """Batch convert files of a specified type in a folder.
+    """Batch convert CSV files in a folder to YAML (and optionally schema).
     
     Args:
         folder: Directory containing files to convert
@@ -173,62 +424,95 @@ def batch_convert(
         recursive: Whether to search subdirectories recursively
         overwrite: Whether to overwrite existing files
         dry_run: If True, only show what would be converted
-        convert_func: Optional custom convert function (uses default CSV converter if None)
+        jobs: Number of parallel workers (default: 1, convert serially); 0 or None
+            for os.cpu_count(). Starting a pool costs more than converting a
+            handful of small files, so parallelism is opt-in
+        incremental: Only convert files whose outputs are missing or out of date
+        schema_only: Only write schemas from the CSV headers, skipping YAML output
+        workers_mode: "process" for a process pool, or "thread" for a thread pool,
+            which avoids worker start-up and pickling costs on batches of small files
     
     Returns:
         Tuple of (success_count, total_count)
     """
-    if not folder.is_dir():
-        raise NotADirectoryError(f"Folder not found: {folder}")
+    files, output_dir = _collect_files(folder, extension, output_dir, recursive, dry_run)
+    if not files:
+        return 0, 0
     
-    # Determine output directory
-    if output_dir is None:
-        output_dir = folder
-    else:
-        output_dir.mkdir(parents=True, exist_ok=True)
+    executor_cls = ThreadPoolExecutor if workers_mode == "thread" else ProcessPoolExecutor
+    success_count = _run_batch(
+        files,
+        convert_file,
+        (output_dir, generate_schema, overwrite, dry_run, incremental, schema_only),
+        jobs,
+        executor_cls,
+    )
+    return success_count, len(files)
+
+
+def batch_convert_with(
+    convert_func: Callable,
+    folder: Path,
+    extension: str = "csv",
+    output_dir: Path | None = None,
+    generate_schema: bool = True,
+    recursive: bool = False,
+    overwrite: bool = False,
+    dry_run: bool = False,
+    jobs: int | None = 1,
+) -> tuple[int, int]:
+    """Batch convert files of a specified type in a folder using a custom convert function.
     
-    # Find matching files
-    files = find_files_by_extension(folder, extension, recursive)
+    Args:
+        convert_func: Called as convert_func(input_file, output_dir, generate_schema,
+            overwrite, dry_run) and returns True on success. Worker processes
+            need a picklable function; anything else, such as a closure or a
+            lambda, is run serially.
+        folder: Directory containing files to convert
+        extension: File extension to filter by (e.g., 'csv' or '.csv')
+        output_dir: Output directory (default: same as input folder)
+        generate_schema: Whether to generate JSON Schema files
+        recursive: Whether to search subdirectories recursively
+        overwrite: Whether to overwrite existing files
+        dry_run: If True, only show what would be converted
+        jobs: Number of worker processes (default: 1, convert serially); 0 or None
+            for os.cpu_count().
+            Workers are always processes, since capturing the function's output swaps
+            the process-wide sys.stdout.
     
+    Returns:
+        Tuple of (success_count, total_count)
+    """
+    files, output_dir = _collect_files(folder, extension, output_dir, recursive, dry_run)
     if not files:
-        ext = normalize_extension(extension)
-        print(f"No {ext} files found in {folder}")
-        if recursive:
-            print("(including subdirectories)")
         return 0, 0
     
-    print(f"Found {len(files)} {normalize_extension(extension)} file(s) to process")
-    if dry_run:
-        print("DRY RUN MODE - No files will be modified")
-    print()
-    
-    success_count = 0
-    total_count = len(files)
-    
-    for i, file_path in enumerate(files, 1):
-        print(f"[{i}/{total_count}] Processing: {file_path.name}")
-        
-        # Use custom convert function if provided, otherwise use default
-        if convert_func:
-            try:
-                result = convert_func(file_path, output_dir, generate_schema, overwrite, dry_run)
-                if result:
-                    success_count += 1
-            except Exception as e:
-                print(f"  ✗ Error: {e}", file=sys.stderr)
-        else:
-            # Use default CSV converter
-            if convert_file(file_path, output_dir, generate_schema, overwrite, dry_run):
-                success_count += 1
-        
-        print()
+    if jobs != 1:
+        try:
+            pickle.dumps(convert_func)
+        except Exception:
+            jobs = 1
     
-    return success_count, total_count
+    success_count = _run_batch(
+        files,
+        _run_convert_func,
+        (convert_func, output_dir, generate_schema, overwrite, dry_run),
+        jobs,
+        ProcessPoolExecutor,
+    )
+    return success_count, len(files)
 
 
 def main() -> None:
     args = parse_args()
     
+    # batch_convert flushes once per file, so line-buffering stdout only adds
+    # write() calls; stderr stays line-buffered so errors show up promptly.
+    if isinstance(sys.stdout, io.TextIOWrapper):
+        sys.stdout.reconfigure(line_buffering=False)
+    if isinstance(sys.stderr, io.TextIOWrapper):
+        sys.stderr.reconfigure(line_buffering=True)
+    
     try:
         success_count, total_count = batch_convert(
             folder=args.folder,
@@ -238,6 +522,10 @@ def main() -> None:
             recursive=args.recursive,
             overwrite=args.overwrite,
             dry_run=args.dry_run,
+            jobs=args.jobs,
+            incremental=args.incremental,
+            schema_only=args.schema_only,
+            workers_mode=args.workers_mode,
         )
         
         print("=" * 60)
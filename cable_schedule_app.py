@@ -1,7 +1,26 @@
+import pandas as pd
 import yaml
 import streamlit as st
 from pathlib import Path
 
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:  # libyaml bindings not available
+    from yaml import SafeDumper, SafeLoader
+
+
+class ScheduleDumper(SafeDumper):
+    """SafeDumper for the cable schedule, whose mappings are always plain dicts."""
+
+
+def _represent_schedule_mapping(dumper, data):
+    # Handing over the items list skips the sort_keys check and keeps insertion order
+    return dumper.represent_mapping("tag:yaml.org,2002:map", list(data.items()))
+
+
+ScheduleDumper.add_representer(dict, _represent_schedule_mapping)
+
+
 # ---- Helpers ----------------------------------------------------------------
 
 def load_yaml(path: Path) -> dict:
@@ -15,12 +34,58 @@ def load_yaml(path: Path) -> dict:
             "patch_leads": [],
         }
     with path.open() as f:
-        return yaml.safe_load(f) or {}
+        return yaml.load(f, Loader=SafeLoader) or {}
+
+
+def file_mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+@st.cache_data(show_spinner=False)
+def load_yaml_cached(path_str: str, mtime_ns: int) -> dict:
+    # mtime_ns is only part of the cache key: an edited file gets a new entry
+    return load_yaml(Path(path_str))
+
+
+def build_lookups(data: dict) -> dict:
+    devices = data.get("devices", [])
+    return {
+        "outlet_ids": [o["id"] for o in data.get("outlets", [])],
+        "panel_ids": [p["id"] for p in data.get("patch_panels", [])],
+        "device_ids": [d["id"] for d in devices],
+        "device_by_id": {d["id"]: d for d in devices},
+    }
+
+
+def get_lookups() -> dict:
+    # Rebuilt only when data_version changes (reload or an appended cable/lead)
+    version = st.session_state.data_version
+    cached = st.session_state.get("lookups")
+    if cached is None or cached[0] != version:
+        cached = (version, build_lookups(st.session_state.data))
+        st.session_state.lookups = cached
+    return cached[1]
+
+
+def get_frame(section: str) -> pd.DataFrame:
+    # One DataFrame per section, rebuilt only when data_version changes
+    version = st.session_state.data_version
+    cached = st.session_state.get("frames")
+    if cached is None or cached[0] != version:
+        cached = (version, {})
+        st.session_state.frames = cached
+    frames = cached[1]
+    if section not in frames:
+        frames[section] = pd.DataFrame(st.session_state.data.get(section, []))
+    return frames[section]
 
 
 def save_yaml(path: Path, data: dict):
     with path.open("w") as f:
-        yaml.safe_dump(data, f, sort_keys=False)
+        yaml.dump(data, f, Dumper=ScheduleDumper)
 
 
 def select_id(options, label, key):
@@ -42,29 +107,37 @@ yaml_path_str = st.text_input(
 )
 yaml_path = Path(yaml_path_str)
 
-if "data" not in st.session_state:
-    st.session_state.data = load_yaml(yaml_path)
+# Loaded once per session; reloading replaces unsaved additions, so it only
+# happens when asked for
+reload_requested = st.button(
+    "🔄 Reload from file",
+    help="Re-read the YAML file at the path above. Cables and patch leads that have not been saved are discarded.",
+)
+if reload_requested or "data" not in st.session_state:
+    st.session_state.data = load_yaml_cached(yaml_path_str, file_mtime_ns(yaml_path))
+    st.session_state.data_version = st.session_state.get("data_version", 0) + 1
 
 data = st.session_state.data
+lookups = get_lookups()
 
 col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("Patch Panels")
-    st.dataframe(data.get("patch_panels", []))
+    st.dataframe(get_frame("patch_panels"))
 
     st.subheader("Outlets")
-    st.dataframe(data.get("outlets", []))
+    st.dataframe(get_frame("outlets"))
 
     st.subheader("Devices")
-    st.dataframe(data.get("devices", []))
+    st.dataframe(get_frame("devices"))
 
 with col2:
     st.subheader("Cables (Outlet → Patch Panel)")
-    st.dataframe(data.get("cables", []))
+    st.dataframe(get_frame("cables"))
 
     st.subheader("Patch Leads (Patch Panel → Device Port)")
-    st.dataframe(data.get("patch_leads", []))
+    st.dataframe(get_frame("patch_leads"))
 
 st.markdown("---")
 
@@ -72,11 +145,8 @@ st.markdown("---")
 
 st.header("➕ Add Horizontal Cable (Outlet → Patch Panel)")
 with st.form("add_cable_form"):
-    outlets = [o["id"] for o in data.get("outlets", [])]
-    panels = [p["id"] for p in data.get("patch_panels", [])]
-
-    outlet_id = select_id(outlets, "Outlet", key="cable_outlet")
-    panel_id = select_id(panels, "Patch Panel", key="cable_panel")
+    outlet_id = select_id(lookups["outlet_ids"], "Outlet", key="cable_outlet")
+    panel_id = select_id(lookups["panel_ids"], "Patch Panel", key="cable_panel")
 
     pp_port = st.number_input("Patch Panel Port", min_value=1, step=1, value=1)
     cable_type = st.text_input("Cable Type", value="cat6")
@@ -98,22 +168,20 @@ with st.form("add_cable_form"):
         data.setdefault("cables", []).append(cable)
         st.success(f"Added cable {new_id}")
         st.session_state.data = data
+        st.session_state.data_version += 1
 
 # ---- Add Patch Lead Form ----------------------------------------------------
 
 st.header("➕ Add Patch Lead (Patch Panel → Device Port)")
 with st.form("add_lead_form"):
-    panels = [p["id"] for p in data.get("patch_panels", [])]
-    devices = [d["id"] for d in data.get("devices", [])]
-
-    panel_id = select_id(panels, "Patch Panel", key="lead_panel")
+    panel_id = select_id(lookups["panel_ids"], "Patch Panel", key="lead_panel")
     pp_port = st.number_input("Patch Panel Port", min_value=1, step=1, value=1, key="lead_port")
 
-    device_id = select_id(devices, "Device", key="lead_device")
+    device_id = select_id(lookups["device_ids"], "Device", key="lead_device")
 
     device_ports = []
     if device_id:
-        dev = next((d for d in data.get("devices", []) if d["id"] == device_id), None)
+        dev = lookups["device_by_id"].get(device_id)
         if dev:
             device_ports = [p["name"] for p in dev.get("ports", [])]
 
@@ -138,6 +206,7 @@ with st.form("add_lead_form"):
         data.setdefault("patch_leads", []).append(lead)
         st.success(f"Added patch lead {new_id}")
         st.session_state.data = data
+        st.session_state.data_version += 1
 
 st.markdown("---")
 
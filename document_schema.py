@@ -3,14 +3,19 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import os
+import pickle
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class Column:
     """Represents a database column."""
 
@@ -23,7 +28,7 @@ class Column:
     check_constraints: List[str] = field(default_factory=list)  # Column-level CHECK constraints
 
 
-@dataclass
+@dataclass(slots=True)
 class ForeignKey:
     """Represents a foreign key relationship."""
 
@@ -34,7 +39,7 @@ class ForeignKey:
     constraint_name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class CheckConstraint:
     """Represents a CHECK constraint."""
 
@@ -42,7 +47,7 @@ class CheckConstraint:
     expression: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Table:
     """Represents a database table with its columns and relationships."""
 
@@ -50,157 +55,395 @@ class Table:
     schema: str = "public"
     columns: List[Column] = field(default_factory=list)
     primary_key_columns: List[str] = field(default_factory=list)
+    primary_key_set: frozenset[str] = field(default_factory=frozenset, repr=False)  # For membership tests
     foreign_keys: List[ForeignKey] = field(default_factory=list)
     check_constraints: List[CheckConstraint] = field(default_factory=list)  # Table-level CHECK constraints
     indexes: List[str] = field(default_factory=list)
     comment: Optional[str] = None
+    full_name: str = ""  # Schema-qualified key in SchemaParser.tables
+
+
+# Regular expressions used by SchemaParser, compiled once at import time.
+# String literals, line comments and block comments in one alternation, matched left
+# to right as SQL lexes them; substituting group 1 keeps literals and drops comments
+_COMMENT_RE = re.compile(r"('[^']*(?:''[^']*)*')|--[^\n]*|/\*(?s:.*?)\*/")
+# Whitespace runs other than a lone space, which is already normalized
+_WHITESPACE_RUN_RE = re.compile(r"[^\S ]\s*| \s+")
+_WHITESPACE_RE = re.compile(r"\s+")
+_CREATE_TABLE_RE = re.compile(
+    r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:(\w+)\.)?(\w+)\s*\(", re.IGNORECASE
+)
+_DELIMITER_RE = re.compile(r"[(),]")
+# Table-level constraint entries in a CREATE TABLE body, as opposed to columns
+_CONSTRAINT_PREFIX_RE = re.compile(r"(?:CONSTRAINT|PRIMARY\s+KEY|FOREIGN\s+KEY|UNIQUE|CHECK)\b", re.IGNORECASE)
+# Column name followed by its data type, if any. The type alternatives are tried
+# in this order (most specific first); whichever matched is the last group.
+_COLUMN_HEAD_RE = re.compile(
+    r"(\w+)\s*(?:"
+    r"((?:\w+\s+)+WITH\s+TIME\s+ZONE)"  # TIMESTAMP WITH TIME ZONE
+    r"|((?:\w+\s+)*\w+\s*\(\s*\d+(?:\s*,\s*\d+)?\s*\))"  # CHARACTER VARYING(5), VARCHAR(50), NUMERIC(8,6), DECIMAL(10,2)
+    r"|((?:\w+\s+)*\w+)"  # Simple types like INTEGER, UUID, CHARACTER VARYING (without size)
+    r")?",
+    re.IGNORECASE,
+)
+_DEFAULT_RE = re.compile(r"DEFAULT\s+((?:(?:[^,\s]+|\([^)]*\))(?:\s|,|$))*)", re.IGNORECASE)
+_DEFAULT_TRAILING_RE = re.compile(
+    r"\s+(?:NOT\s+NULL|UNIQUE|CHECK|PRIMARY|FOREIGN|CONSTRAINT).*$", re.IGNORECASE
+)
+# UNIQUE as a keyword rather than part of a name such as unique_ref
+_UNIQUE_RE = re.compile(r"\bUNIQUE\b", re.IGNORECASE)
+_CHECK_RE = re.compile(r"CHECK\s*\(", re.IGNORECASE)
+_PK_KEYWORD_RE = re.compile(r"\bPRIMARY\s+KEY\b", re.IGNORECASE)
+_PK_INLINE_RE = re.compile(r"(\w+)\s+\w+.*?\bPRIMARY\s+KEY\b", re.IGNORECASE)
+_PK_CONSTRAINT_RE = re.compile(r"(?:CONSTRAINT\s+\w+\s+)?PRIMARY\s+KEY\s*\(\s*([^)]+)\s*\)", re.IGNORECASE)
+_TABLE_FK_RE = re.compile(
+    r"(?:CONSTRAINT\s+(\w+)\s+)?FOREIGN\s+KEY\s*\(\s*([^)]+)\s*\)\s*"
+    r"REFERENCES\s+(?:(\w+)\.)?(\w+)\s*\(\s*([^)]+)\s*\)",
+    re.IGNORECASE,
+)
+_TABLE_CHECK_RE = re.compile(r"^(?:CONSTRAINT\s+(\w+)\s+)?CHECK\s*\(", re.IGNORECASE)
+_ALTER_FK_RE = re.compile(
+    r"ALTER\s+TABLE\s+(?:ONLY\s+)?(?:(\w+)\.)?(\w+)\s+(?:IF\s+EXISTS\s+)?"
+    r"ADD\s+CONSTRAINT\s+(\w+)\s+"
+    r"FOREIGN\s+KEY\s*\(\s*([^)]+)\s*\)\s*"
+    r"REFERENCES\s+(?:(\w+)\.)?(\w+)\s*\(\s*([^)]+)\s*\)"
+    r"(?:\s+ON\s+DELETE\s+\w+)?",
+    re.IGNORECASE | re.DOTALL,
+)
+_ALTER_CHECK_RE = re.compile(
+    r"ALTER\s+TABLE\s+(?:(\w+)\.)?(\w+)\s+"
+    r"ADD\s+(?:CONSTRAINT\s+(\w+)\s+)?CHECK\s*\(",
+    re.IGNORECASE | re.DOTALL,
+)
+# Standard format with columns in parentheses
+_INDEX_RE = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:\w+\.)?(\w+)\s+"
+    r"ON\s+(?:ONLY\s+)?(?:(\w+)\.)?(\w+)\s+"
+    r"(?:USING\s+(\w+)\s+)?"
+    r"\(",
+    re.IGNORECASE | re.DOTALL,
+)
+# USING method(expression) format where USING method directly precedes parentheses
+_INDEX_USING_RE = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:\w+\.)?(\w+)\s+"
+    r"ON\s+(?:ONLY\s+)?(?:(\w+)\.)?(\w+)\s+"
+    r"USING\s+(\w+)\(",
+    re.IGNORECASE | re.DOTALL,
+)
+_TRAILING_USING_RE = re.compile(r"^\s*USING\s+(\w+)", re.IGNORECASE)
+# Statement keywords SchemaParser cares about, found in one pass over the file.
+# The case-sensitive leading character class lets re skip ahead between candidates,
+# which it cannot do for a case-insensitive alternation.
+_STATEMENT_RE = re.compile(
+    r"[AaCc](?i:(?<=C)REATE\s+(?:(TABLE)|(?:UNIQUE\s+)?(INDEX))"
+    r"|(?<=C)OMMENT\s+ON\s+(TABLE)"
+    r"|(?<=A)LTER\s+(TABLE))"
+)
+_STATEMENT_KINDS = ("create_table", "create_index", "comment", "alter_table")
+_TABLE_COMMENT_RE = re.compile(r"COMMENT\s+ON\s+TABLE\s+(?:(\w+)\.)?(\w+)\s+IS\s+'([^']+)'", re.IGNORECASE)
+
+# Part of the parse cache stamp along with a hash of this module's source, so any
+# edit to the parser or the dataclasses it pickles invalidates older results;
+# bump it for changes that live outside this file.
+_PARSER_VERSION = 4
+# Set to "0" to disable the parse cache.
+CACHE_ENV_VAR = "SCHEMA_PARSER_CACHE"
+
+
+def _find_statement_starts(sql: str) -> Dict[str, List[int]]:
+    """Return the start offsets of each kind of statement in _STATEMENT_KINDS."""
+    starts: Dict[str, List[int]] = {kind: [] for kind in _STATEMENT_KINDS}
+    for match in _STATEMENT_RE.finditer(sql):
+        starts[_STATEMENT_KINDS[match.lastindex - 1]].append(match.start())
+    return starts
+
+
+def _find_closing_paren(text: str, start: int) -> int:
+    """Return the index of the ')' closing a '(' opened just before start, or -1.
+    
+    Jumps between parentheses with str.find instead of stepping through
+    every character; the '(' search is bounded by the next ')'.
+    """
+    depth = 1
+    pos = start
+    while True:
+        close = text.find(")", pos)
+        if close == -1:
+            return -1
+        opening = text.find("(", pos, close)
+        if opening == -1:
+            depth -= 1
+            if depth == 0:
+                return close
+            pos = close + 1
+        else:
+            depth += 1
+            pos = opening + 1
+
+
+@lru_cache(maxsize=4096)
+def _qualified(schema: str, name: str) -> str:
+    """Return the key a table is stored under: bare for public, schema.name otherwise."""
+    return sys.intern(f"{schema}.{name}" if schema != "public" else name)
+
+
+def _split_column_list(cols_str: str) -> List[str]:
+    """Split a parenthesized column list into interned, unquoted column names.
+    
+    Names repeat across tables and constraints, so interning lets them share
+    one string object and makes later equality checks cheap.
+    """
+    return [sys.intern(col.strip().strip('"')) for col in cols_str.split(",")]
+
+
+def _match_at(pattern: re.Pattern, sql: str, starts: Iterable[int]) -> Iterator[re.Match]:
+    """Yield non-overlapping matches of pattern beginning at the given offsets.
+    
+    Equivalent to pattern.finditer(sql) when every match of pattern starts at
+    one of the offsets, but without scanning the text in between.
+    """
+    end = 0
+    for start in starts:
+        if start >= end:
+            match = pattern.match(sql, start)
+            if match:
+                end = match.end()
+                yield match
+
+
+@lru_cache(maxsize=1)
+def _module_fingerprint() -> Optional[str]:
+    """Hash this module's source for the parse cache key, or None if it cannot be read."""
+    try:
+        source = Path(__file__).read_bytes()
+    except OSError:
+        return None
+    return hashlib.blake2b(source, digest_size=16).hexdigest()
 
 
 class SchemaParser:
     """Parser for PostgreSQL schema SQL files."""
 
-    def __init__(self, sql_file: Path):
-        """Initialize parser with SQL file path."""
+    def __init__(self, sql_file: Path, jobs: int = 1):
+        """Initialize parser with SQL file path.
+        
+        jobs is the number of worker processes used to parse table bodies
+        (default: 1, parse serially). Starting the pool and sending the tables
+        back cost about as much as parsing them, so only very large schemas on
+        several cores gain from more.
+        """
         if not sql_file.is_file():
             raise FileNotFoundError(f"SQL file not found: {sql_file}")
         self.sql_file = sql_file
-        self.sql_content: str = ""
+        self.jobs = jobs
+        self._sql_content: Optional[str] = None
         self.tables: Dict[str, Table] = {}
         self.relationships: List[ForeignKey] = []
 
     def parse(self) -> Dict[str, Table]:
-        """Parse the SQL file and extract schema information."""
+        """Parse the SQL file and extract schema information.
+        
+        Results are cached on disk, one entry per file path stamped with the
+        file's size and mtime and the parser's source, so documenting an
+        unchanged dump again skips parsing entirely.
+        """
+        cache = self._cache_entry()
+        if cache is not None and self._load_cache(*cache):
+            return self.tables
+
+        self._parse_sql()
+
+        if cache is not None:
+            self._store_cache(*cache)
+        return self.tables
+
+    @property
+    def sql_content(self) -> str:
+        """The SQL file's text; read on first use when parse() was served from the cache."""
+        if self._sql_content is None:
+            with self.sql_file.open(encoding="utf-8") as f:
+                self._sql_content = f.read()
+        return self._sql_content
+
+    def _cache_entry(self) -> Optional[Tuple[Path, Tuple[object, ...]]]:
+        """Return the SQL file's cache file and the stamp of its current contents.
+        
+        The file name depends on the resolved path alone, so storing a fresh
+        parse replaces the entry of an earlier version of the same file instead
+        of adding another. Returns None if caching is off.
+        """
+        fingerprint = _module_fingerprint()
+        if os.environ.get(CACHE_ENV_VAR) == "0" or fingerprint is None:
+            return None
+        stat = self.sql_file.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size, _PARSER_VERSION, fingerprint)
+        key = str(self.sql_file.resolve()).encode("utf-8", "surrogateescape")
+        digest = hashlib.blake2b(key, digest_size=16).hexdigest()
+        # Per-user directory: unpickling a file someone else could plant in /tmp is unsafe
+        cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        return Path(cache_home) / "csv_to_yaml" / f"schema_{digest}.pkl", stamp
+
+    def _load_cache(self, cache_path: Path, stamp: Tuple[object, ...]) -> bool:
+        """Load tables and relationships stored under stamp; return False on a miss."""
+        try:
+            with cache_path.open("rb") as f:
+                cached_stamp, tables, relationships = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError, TypeError):
+            return False
+        if cached_stamp != stamp:
+            return False
+        self.tables, self.relationships = tables, relationships
+        return True
+
+    def _store_cache(self, cache_path: Path, stamp: Tuple[object, ...]) -> None:
+        """Write the parse results to cache_path; failures only cost the next run a parse."""
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            with tmp_path.open("wb") as f:
+                pickle.dump((stamp, self.tables, self.relationships), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    def _parse_sql(self) -> None:
+        """Read the SQL file and run every parsing pass over it."""
         with self.sql_file.open(encoding="utf-8") as f:
-            self.sql_content = f.read()
+            self._sql_content = f.read()
 
         # Normalize the SQL content (remove comments, normalize whitespace)
         normalized = self._normalize_sql(self.sql_content)
 
+        # Locate every statement of interest in a single scan; the passes below
+        # still run in this order because later ones need the parsed tables
+        starts = _find_statement_starts(normalized)
+
         # Extract table definitions (includes foreign keys now)
-        self._parse_tables(normalized)
+        self._parse_tables(normalized, starts["create_table"])
 
         # Extract foreign keys from ALTER TABLE statements
-        self._parse_alter_table_foreign_keys(normalized)
+        self._parse_alter_table_foreign_keys(normalized, starts["alter_table"])
 
         # Extract CHECK constraints from ALTER TABLE statements
-        self._parse_alter_table_check_constraints(normalized)
+        self._parse_alter_table_check_constraints(normalized, starts["alter_table"])
 
         # Extract indexes
-        self._parse_indexes(normalized)
+        self._parse_indexes(normalized, starts["create_index"])
 
         # Extract table comments
-        self._parse_table_comments(normalized)
-
-        return self.tables
+        self._parse_table_comments(normalized, starts["comment"])
 
     def _normalize_sql(self, sql: str) -> str:
         """Normalize SQL content by removing comments and normalizing whitespace."""
-        # Remove single-line comments (-- style)
-        sql = re.sub(r"--.*?$", "", sql, flags=re.MULTILINE)
-        # Remove multi-line comments (/* */ style)
-        sql = re.sub(r"/\*.*?\*/", "", sql, flags=re.DOTALL)
-        # Normalize whitespace
-        sql = re.sub(r"\s+", " ", sql)
-        return sql
-
-    def _parse_tables(self, sql: str) -> None:
-        """Parse CREATE TABLE statements."""
-        # Match CREATE TABLE statements - need to handle nested parentheses correctly
-        pattern = r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:(\w+)\.)?(\w+)\s*\((.*?)\)(?:\s*;)?"
+        # Substring checks are far cheaper than a regex pass over comment-free dumps
+        if "--" in sql or "/*" in sql:
+            sql = _COMMENT_RE.sub(r"\1", sql)
+        return _WHITESPACE_RUN_RE.sub(" ", sql)
+
+    def _parse_tables(self, sql: str, starts: List[int]) -> None:
+        """Parse CREATE TABLE statements beginning at the given offsets.
         
-        # Need to find matching parentheses for table definitions
+        Table bodies are independent of each other, so with jobs > 1 they are
+        parsed across worker processes.
+        """
+        spans = self._find_table_spans(sql, starts)
+        workers = min(self.jobs, len(spans))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(spans) // (workers * 4))
+                tables = list(pool.map(SchemaParser._build_table, *zip(*spans), chunksize=chunksize))
+        else:
+            tables = [self._build_table(*span) for span in spans]
+
+        for table in tables:
+            # Store table with schema-qualified name
+            self.tables[table.full_name] = table
+            
+            # Also add to relationships list
+            for fk in table.foreign_keys:
+                self.relationships.append(fk)
+
+    def _find_table_spans(self, sql: str, starts: List[int]) -> List[Tuple[str, str, str]]:
+        """Return (schema, table_name, table_def) for each CREATE TABLE statement."""
+        spans = []
+        # Match CREATE TABLE statements - need to find matching parentheses for table definitions
         i = 0
-        while i < len(sql):
-            create_match = re.search(r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:(\w+)\.)?(\w+)\s*\(", sql[i:], re.IGNORECASE)
+        for start in starts:
+            if start < i:
+                continue
+            create_match = _CREATE_TABLE_RE.match(sql, start)
             if not create_match:
-                break
+                continue
             
-            start_pos = i + create_match.start()
-            schema = create_match.group(1) or "public"
-            table_name = create_match.group(2)
+            schema = sys.intern(create_match.group(1) or "public")
+            table_name = sys.intern(create_match.group(2))
             
             # Find the matching closing parenthesis for the table definition
-            paren_pos = i + create_match.end() - 1  # Position of opening (
-            paren_depth = 1
-            j = paren_pos + 1
+            paren_pos = create_match.end() - 1  # Position of opening (
+            close_pos = _find_closing_paren(sql, paren_pos + 1)
+            # An unbalanced definition runs to the end of the file, as before
+            j = close_pos + 1 if close_pos != -1 else len(sql)
             
-            while j < len(sql) and paren_depth > 0:
-                if sql[j] == '(':
-                    paren_depth += 1
-                elif sql[j] == ')':
-                    paren_depth -= 1
-                j += 1
-            
-            if paren_depth == 0:
-                table_def = sql[paren_pos + 1:j - 1]
-                
-                table = Table(name=table_name, schema=schema)
-                table.columns = self._parse_columns(table_def)
-                table.primary_key_columns = self._extract_primary_key(table_def)
-                table.foreign_keys = self._parse_table_foreign_keys(table_def, table_name, schema)
-                table.check_constraints = self._parse_table_check_constraints(table_def)
-
-                # Store table with schema-qualified name
-                full_name = f"{schema}.{table_name}" if schema != "public" else table_name
-                self.tables[full_name] = table
-                
-                # Also add to relationships list
-                for fk in table.foreign_keys:
-                    self.relationships.append(fk)
+            if close_pos != -1:
+                spans.append((schema, table_name, sql[paren_pos + 1:close_pos]))
             
             i = j
 
-    def _parse_columns(self, table_def: str) -> List[Column]:
-        """Parse column definitions from table definition."""
+        return spans
+
+    @staticmethod
+    def _build_table(schema: str, table_name: str, table_def: str) -> Table:
+        """Build a Table from the body of its CREATE TABLE statement."""
+        table = Table(name=table_name, schema=schema, full_name=_qualified(schema, table_name))
+        # Split by comma once, respecting parentheses; columns and CHECK constraints share the parts
+        parts = SchemaParser._split_table_definition(table_def)
+        table.columns = SchemaParser._parse_columns(parts)
+        table.primary_key_columns = SchemaParser._extract_primary_key(table_def)
+        table.primary_key_set = frozenset(table.primary_key_columns)
+        # Most tables have neither clause; a substring test skips the case-insensitive scans
+        upper_def = table_def.upper()
+        if "FOREIGN" in upper_def:
+            table.foreign_keys = SchemaParser._parse_table_foreign_keys(table_def, table_name, schema)
+        if "CHECK" in upper_def:
+            table.check_constraints = SchemaParser._parse_table_check_constraints(parts)
+        return table
+
+    @staticmethod
+    def _parse_columns(parts: List[str]) -> List[Column]:
+        """Parse column definitions from the split parts of a table definition."""
         columns: List[Column] = []
-        # Split by comma, but respect parentheses for complex types
-        column_defs = self._split_table_definition(table_def)
 
-        for col_def in column_defs:
+        for col_def in parts:
             col_def = col_def.strip()
-            if not col_def or col_def.upper().startswith(("CONSTRAINT", "PRIMARY KEY", "FOREIGN KEY", "UNIQUE", "CHECK")):
+            if not col_def or _CONSTRAINT_PREFIX_RE.match(col_def):
                 continue
 
-            # Extract column name
-            name_match = re.match(r"^(\w+)", col_def)
-            if not name_match:
+            # Extract column name and data type - handle complex types with parentheses
+            head_match = _COLUMN_HEAD_RE.match(col_def)
+            if not head_match:
                 continue
 
-            col_name = name_match.group(1)
-            rest = col_def[len(col_name):].strip()
-
-            # Extract data type - handle complex types with parentheses
-            # Try patterns in order of complexity
+            col_name = sys.intern(head_match.group(1))
             data_type = "unknown"
-            type_patterns = [
-                (r"^((?:\w+\s+)+WITH\s+TIME\s+ZONE)", 25),  # TIMESTAMP WITH TIME ZONE (longest first)
-                (r"^((?:\w+\s+)*\w+\s*\(\s*\d+(?:\s*,\s*\d+)?\s*\))", 20),  # CHARACTER VARYING(5), VARCHAR(50), NUMERIC(8,6), DECIMAL(10,2)
-                (r"^((?:\w+\s+)*\w+)", 10),  # Simple types like INTEGER, UUID, CHARACTER VARYING (without size)
-            ]
-            
-            for pattern, _ in sorted(type_patterns, key=lambda x: x[1], reverse=True):
-                type_match = re.match(pattern, rest, re.IGNORECASE)
-                if type_match:
-                    data_type = type_match.group(1).strip()
-                    # Normalize spacing in data type (collapse multiple spaces to single space)
-                    data_type = re.sub(r'\s+', ' ', data_type)
-                    break
+            if head_match.lastindex > 1:
+                data_type = head_match.group(head_match.lastindex).strip()
+                # Normalize spacing in data type (collapse multiple spaces to single space)
+                data_type = sys.intern(_WHITESPACE_RE.sub(' ', data_type))
 
             # Check for constraints in the full column definition
-            is_nullable = "NOT NULL" not in col_def.upper()
-            is_unique = "UNIQUE" in col_def.upper()
+            upper = col_def.upper()
+            is_nullable = "NOT NULL" not in upper
+            # The substring test rules out most columns before the word-boundary check
+            is_unique = "UNIQUE" in upper and _UNIQUE_RE.search(col_def) is not None
 
             # Extract default value - handle function calls and complex expressions
             # Look for DEFAULT keyword and extract what follows until next constraint/keyword
-            default_match = re.search(
-                r"DEFAULT\s+((?:(?:[^,\s]+|\([^)]*\))(?:\s|,|$))*)",
-                col_def,
-                re.IGNORECASE
-            )
+            # Most columns have no default, so skip the regex when the keyword is absent
+            default_match = _DEFAULT_RE.search(col_def) if "DEFAULT" in upper else None
             if default_match:
                 default_str = default_match.group(1).strip()
                 # Remove trailing keywords that might have been captured
-                default_str = re.sub(r'\s+(?:NOT\s+NULL|UNIQUE|CHECK|PRIMARY|FOREIGN|CONSTRAINT).*$', '', default_str, flags=re.IGNORECASE)
+                default_str = _DEFAULT_TRAILING_RE.sub('', default_str)
                 default_str = default_str.strip().rstrip(',')
                 # Clean up the default value
                 default_value = default_str.strip("'\"")
@@ -211,7 +454,9 @@ class SchemaParser:
                 default_value = None
 
             # Extract column-level CHECK constraints (inline)
-            check_constraints = self._extract_column_check_constraints(col_def)
+            check_constraints = (
+                SchemaParser._extract_column_check_constraints(col_def) if "CHECK" in upper else []
+            )
 
             columns.append(
                 Column(
@@ -226,86 +471,78 @@ class SchemaParser:
 
         return columns
 
-    def _extract_column_check_constraints(self, col_def: str) -> List[str]:
+    @staticmethod
+    def _extract_column_check_constraints(col_def: str) -> List[str]:
         """Extract inline CHECK constraints from a column definition.
         
         Handles nested parentheses in CHECK expressions.
         """
         check_constraints = []
         # Find all CHECK keywords
-        check_pattern = r"CHECK\s*\("
-        matches = list(re.finditer(check_pattern, col_def, re.IGNORECASE))
+        matches = list(_CHECK_RE.finditer(col_def))
         
         for match in matches:
             # Start after the opening parenthesis
             start_pos = match.end()
-            paren_depth = 1
-            i = start_pos
+            close_pos = _find_closing_paren(col_def, start_pos)
             
-            # Find the matching closing parenthesis
-            while i < len(col_def) and paren_depth > 0:
-                if col_def[i] == '(':
-                    paren_depth += 1
-                elif col_def[i] == ')':
-                    paren_depth -= 1
-                i += 1
-            
-            if paren_depth == 0:
-                expression = col_def[start_pos:i-1].strip()
+            if close_pos != -1:
+                expression = col_def[start_pos:close_pos].strip()
                 check_constraints.append(expression)
         
         return check_constraints
 
-    def _split_table_definition(self, table_def: str) -> List[str]:
+    @staticmethod
+    def _split_table_definition(table_def: str) -> List[str]:
         """Split table definition into individual column/constraint definitions."""
         parts = []
-        current = ""
+        start = 0
         paren_depth = 0
 
-        for char in table_def:
+        # Only parentheses and commas matter, so step over those and slice between them
+        for match in _DELIMITER_RE.finditer(table_def):
+            char = match.group()
             if char == "(":
                 paren_depth += 1
-                current += char
             elif char == ")":
                 paren_depth -= 1
-                current += char
-            elif char == "," and paren_depth == 0:
-                parts.append(current.strip())
-                current = ""
-            else:
-                current += char
+            elif paren_depth == 0:
+                parts.append(table_def[start:match.start()].strip())
+                start = match.end()
 
-        if current.strip():
-            parts.append(current.strip())
+        last = table_def[start:].strip()
+        if last:
+            parts.append(last)
 
         return parts
 
-    def _extract_primary_key(self, table_def: str) -> List[str]:
+    @staticmethod
+    def _extract_primary_key(table_def: str) -> List[str]:
         """Extract primary key column names from table definition."""
-        # Look for PRIMARY KEY constraint in column definitions
-        pk_inline = re.findall(r"(\w+)\s+\w+.*?\bPRIMARY\s+KEY\b", table_def, re.IGNORECASE)
+        # Look for PRIMARY KEY constraint in column definitions. Every match ends at a
+        # PRIMARY KEY keyword, so stop the scan at the last one: past it the lazy .*?
+        # can only fail, and retrying it from every position is super-linear.
+        last_pk = None
+        for last_pk in _PK_KEYWORD_RE.finditer(table_def):
+            pass
+        pk_inline = _PK_INLINE_RE.findall(table_def, 0, last_pk.end()) if last_pk else []
         if pk_inline:
-            return pk_inline
+            return [sys.intern(name) for name in pk_inline]
 
         # Look for CONSTRAINT ... PRIMARY KEY (...) definition
-        pk_pattern = r"(?:CONSTRAINT\s+\w+\s+)?PRIMARY\s+KEY\s*\(\s*([^)]+)\s*\)"
-        pk_match = re.search(pk_pattern, table_def, re.IGNORECASE)
+        pk_match = _PK_CONSTRAINT_RE.search(table_def)
         if pk_match:
-            pk_cols_str = pk_match.group(1)
-            pk_cols = [col.strip().strip('"') for col in pk_cols_str.split(",")]
-            return pk_cols
+            return _split_column_list(pk_match.group(1))
 
         return []
 
-    def _parse_table_foreign_keys(self, table_def: str, table_name: str, schema: str) -> List[ForeignKey]:
+    @staticmethod
+    def _parse_table_foreign_keys(table_def: str, table_name: str, schema: str) -> List[ForeignKey]:
         """Parse FOREIGN KEY constraints from a table definition."""
         foreign_keys = []
         # Match FOREIGN KEY constraints in the table definition
-        fk_pattern = (
-            r"(?:CONSTRAINT\s+(\w+)\s+)?FOREIGN\s+KEY\s*\(\s*([^)]+)\s*\)\s*"
-            r"REFERENCES\s+(?:(\w+)\.)?(\w+)\s*\(\s*([^)]+)\s*\)"
-        )
-        matches = re.finditer(fk_pattern, table_def, re.IGNORECASE)
+        matches = _TABLE_FK_RE.finditer(table_def)
+        full_table_name = _qualified(schema, table_name)
 
         for match in matches:
             constraint_name = match.group(1) or "unnamed"
@@ -314,11 +551,10 @@ class SchemaParser:
             ref_table = match.group(4)
             to_cols_str = match.group(5)
 
-            from_cols = [col.strip().strip('"') for col in from_cols_str.split(",")]
-            to_cols = [col.strip().strip('"') for col in to_cols_str.split(",")]
+            from_cols = _split_column_list(from_cols_str)
+            to_cols = _split_column_list(to_cols_str)
 
-            full_table_name = f"{schema}.{table_name}" if schema != "public" else table_name
-            ref_table_full = f"{ref_schema}.{ref_table}" if ref_schema != "public" else ref_table
+            ref_table_full = _qualified(ref_schema, ref_table)
 
             fk = ForeignKey(
                 from_table=full_table_name,
@@ -331,16 +567,15 @@ class SchemaParser:
 
         return foreign_keys
 
-    def _parse_table_check_constraints(self, table_def: str) -> List[CheckConstraint]:
-        """Parse table-level CHECK constraints from a table definition.
+    @staticmethod
+    def _parse_table_check_constraints(parts: List[str]) -> List[CheckConstraint]:
+        """Parse table-level CHECK constraints from the split parts of a table definition.
         
         Table-level CHECK constraints are separate CONSTRAINT clauses,
         not inline with column definitions. These appear at the bottom of
         CREATE TABLE blocks as standalone CONSTRAINT definitions.
         """
         check_constraints = []
-        # Split table definition to get individual parts
-        parts = self._split_table_definition(table_def)
         
         for part in parts:
             part = part.strip()
@@ -350,11 +585,7 @@ class SchemaParser:
             # Look for standalone CHECK constraints (not inline with columns)
             # Pattern: CONSTRAINT name CHECK (expression) or just CHECK (expression)
             # Check if this part starts with CONSTRAINT or CHECK
-            check_match = re.match(
-                r"^(?:CONSTRAINT\s+(\w+)\s+)?CHECK\s*\(",
-                part,
-                re.IGNORECASE
-            )
+            check_match = _TABLE_CHECK_RE.match(part)
             
             if check_match:
                 constraint_name = check_match.group(1)
@@ -362,94 +593,55 @@ class SchemaParser:
                 # Find the opening parenthesis after CHECK
                 expression_start = part.find('(', check_match.end() - 1)
                 if expression_start != -1:
-                    paren_depth = 0
-                    i = expression_start
-                    while i < len(part):
-                        if part[i] == '(':
-                            paren_depth += 1
-                        elif part[i] == ')':
-                            paren_depth -= 1
-                            if paren_depth == 0:
-                                expression = part[expression_start+1:i].strip()
-                                check_constraints.append(
-                                    CheckConstraint(
-                                        name=constraint_name,
-                                        expression=expression
-                                    )
-                                )
-                                break
-                        i += 1
+                    close_pos = _find_closing_paren(part, expression_start + 1)
+                    if close_pos != -1:
+                        expression = part[expression_start+1:close_pos].strip()
+                        check_constraints.append(
+                            CheckConstraint(
+                                name=constraint_name,
+                                expression=expression
+                            )
+                        )
         
         return check_constraints
 
-    def _parse_alter_table_foreign_keys(self, sql: str) -> None:
+    def _parse_alter_table_foreign_keys(self, sql: str, starts: List[int]) -> None:
         """Parse FOREIGN KEY constraints added via ALTER TABLE statements.
         
         Handles both single-line and multi-line ALTER TABLE statements,
         including when all ALTER TABLE statements are grouped at the end of the file.
         Also handles cases where ALTER TABLE and ADD CONSTRAINT are on separate lines.
         """
-        # Find ALTER TABLE statements - handle multi-line format including ALTER TABLE ONLY
-        alter_table_pattern = r"ALTER\s+TABLE\s+(?:ONLY\s+)?(?:(\w+)\.)?(\w+)\s+(?:IF\s+EXISTS\s+)?"
-        alter_matches = list(re.finditer(alter_table_pattern, sql, re.IGNORECASE | re.DOTALL))
-
-        for alter_match in alter_matches:
-            table_schema = alter_match.group(1) or "public"
-            table_name = alter_match.group(2)
-            alter_start = alter_match.end()
-            
-            # Look for ADD CONSTRAINT ... FOREIGN KEY ... after this ALTER TABLE
-            # This might be on the same line or following lines (within reasonable distance)
-            search_window = sql[alter_start:alter_start + 2000]  # Search within 2000 chars
-            
-            # Find ADD CONSTRAINT pattern (may be on same or next line)
-            add_constraint_match = re.search(
-                r"ADD\s+CONSTRAINT\s+(\w+)\s+",
-                search_window,
-                re.IGNORECASE | re.DOTALL
-            )
-            
-            if not add_constraint_match:
-                continue
-            
-            constraint_name = add_constraint_match.group(1)
-            constraint_start = alter_start + add_constraint_match.end()
-            
-            # Look for FOREIGN KEY after the constraint name
-            fk_search_window = sql[constraint_start:constraint_start + 1000]
-            fk_match = re.search(
-                r"FOREIGN\s+KEY\s*\(\s*([^)]+)\s*\)\s*"
-                r"REFERENCES\s+(?:(\w+)\.)?(\w+)\s*\(\s*([^)]+)\s*\)"
-                r"(?:\s+ON\s+DELETE\s+\w+)?",
-                fk_search_window,
-                re.IGNORECASE | re.DOTALL
-            )
-            
-            if fk_match:
-                from_cols_str = fk_match.group(1)
-                ref_schema = fk_match.group(2) or "public"
-                ref_table = fk_match.group(3)
-                to_cols_str = fk_match.group(4)
-
-                from_cols = [col.strip().strip('"') for col in from_cols_str.split(",")]
-                to_cols = [col.strip().strip('"') for col in to_cols_str.split(",")]
-
-                full_table_name = f"{table_schema}.{table_name}" if table_schema != "public" else table_name
-                ref_table_full = f"{ref_schema}.{ref_table}" if ref_schema != "public" else ref_table
-
-                # Only add if table exists (tables should be parsed first)
-                if full_table_name in self.tables:
-                    fk = ForeignKey(
-                        from_table=full_table_name,
-                        from_columns=from_cols,
-                        to_table=ref_table_full,
-                        to_columns=to_cols,
-                        constraint_name=constraint_name,
-                    )
-                    self.tables[full_table_name].foreign_keys.append(fk)
-                    self.relationships.append(fk)
+        # One anchored match per statement: ALTER TABLE [ONLY] ... ADD CONSTRAINT ... FOREIGN KEY
+        for fk_match in _match_at(_ALTER_FK_RE, sql, starts):
+            table_schema = fk_match.group(1) or "public"
+            table_name = fk_match.group(2)
+            constraint_name = fk_match.group(3)
+            from_cols_str = fk_match.group(4)
+            ref_schema = fk_match.group(5) or "public"
+            ref_table = fk_match.group(6)
+            to_cols_str = fk_match.group(7)
+
+            from_cols = _split_column_list(from_cols_str)
+            to_cols = _split_column_list(to_cols_str)
+
+            full_table_name = _qualified(table_schema, table_name)
+            ref_table_full = _qualified(ref_schema, ref_table)
+
+            # Only add if table exists (tables should be parsed first)
+            table = self.tables.get(full_table_name)
+            if table is not None:
+                fk = ForeignKey(
+                    from_table=full_table_name,
+                    from_columns=from_cols,
+                    to_table=ref_table_full,
+                    to_columns=to_cols,
+                    constraint_name=constraint_name,
+                )
+                table.foreign_keys.append(fk)
+                self.relationships.append(fk)
 
-    def _parse_alter_table_check_constraints(self, sql: str) -> None:
+    def _parse_alter_table_check_constraints(self, sql: str, starts: List[int]) -> None:
         """Parse CHECK constraints added via ALTER TABLE statements.
         
         Handles both single-line and multi-line ALTER TABLE statements,
@@ -457,11 +649,7 @@ class SchemaParser:
         Handles nested parentheses in CHECK expressions.
         """
         # Match ALTER TABLE ... ADD (CONSTRAINT ...)? CHECK ...
-        alter_pattern = (
-            r"ALTER\s+TABLE\s+(?:(\w+)\.)?(\w+)\s+"
-            r"ADD\s+(?:CONSTRAINT\s+(\w+)\s+)?CHECK\s*\("
-        )
-        matches = re.finditer(alter_pattern, sql, re.IGNORECASE | re.DOTALL)
+        matches = _match_at(_ALTER_CHECK_RE, sql, starts)
 
         for match in matches:
             table_schema = match.group(1) or "public"
@@ -470,20 +658,12 @@ class SchemaParser:
             
             # Find the matching closing parenthesis for the CHECK expression
             start_pos = match.end()  # Position after opening parenthesis
-            paren_depth = 1
-            i = start_pos
+            close_pos = _find_closing_paren(sql, start_pos)
             
-            while i < len(sql) and paren_depth > 0:
-                if sql[i] == '(':
-                    paren_depth += 1
-                elif sql[i] == ')':
-                    paren_depth -= 1
-                i += 1
-            
-            if paren_depth == 0:
-                expression = sql[start_pos:i-1].strip()
+            if close_pos != -1:
+                expression = sql[start_pos:close_pos].strip()
                 
-                full_table_name = f"{table_schema}.{table_name}" if table_schema != "public" else table_name
+                full_table_name = _qualified(table_schema, table_name)
                 
                 # Only add if table exists
                 if full_table_name in self.tables:
@@ -493,7 +673,7 @@ class SchemaParser:
                     )
                     self.tables[full_table_name].check_constraints.append(check_constraint)
 
-    def _parse_indexes(self, sql: str) -> None:
+    def _parse_indexes(self, sql: str, starts: List[int]) -> None:
         """Parse CREATE INDEX statements.
         
         Handles both single-line and multi-line CREATE INDEX statements,
@@ -506,38 +686,29 @@ class SchemaParser:
         """
         # Find CREATE INDEX statements - handle both formats
         # Pattern 1: Standard format with columns in parentheses
-        index_pattern1 = (
-            r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:\w+\.)?(\w+)\s+"
-            r"ON\s+(?:ONLY\s+)?(?:(\w+)\.)?(\w+)\s+"
-            r"(?:USING\s+(\w+)\s+)?"
-            r"\("
-        )
-        matches = re.finditer(index_pattern1, sql, re.IGNORECASE | re.DOTALL)
+        matches = _match_at(_INDEX_RE, sql, starts)
 
         for match in matches:
             index_name = match.group(1)
             schema = match.group(2) or "public"
             table_name = match.group(3)
+            full_table_name = _qualified(schema, table_name)
+            table = self.tables.get(full_table_name)
+            if table is None:
+                continue  # Index on a table we did not parse; skip scanning its columns
             using_clause = match.group(4)  # USING clause before column list
             start_pos = match.end()  # Position after opening parenthesis
             
             # Extract column list/expression with balanced parentheses
-            paren_depth = 1
-            i = start_pos
-            while i < len(sql) and paren_depth > 0:
-                if sql[i] == '(':
-                    paren_depth += 1
-                elif sql[i] == ')':
-                    paren_depth -= 1
-                i += 1
+            close_pos = _find_closing_paren(sql, start_pos)
             
-            if paren_depth == 0:
-                columns = sql[start_pos:i-1].strip()  # Exclude the closing parenthesis
+            if close_pos != -1:
+                columns = sql[start_pos:close_pos].strip()  # Exclude the closing parenthesis
                 
                 # Check if there's a USING clause after the column list
                 if not using_clause:
-                    remaining = sql[i:i+200].strip()  # Look ahead a bit for USING clause
-                    using_match = re.match(r"^\s*USING\s+(\w+)", remaining, re.IGNORECASE)
+                    remaining = sql[close_pos+1:close_pos+201].strip()  # Look ahead a bit for USING clause
+                    using_match = _TRAILING_USING_RE.match(remaining)
                     if using_match:
                         using_clause = using_match.group(1)
                 
@@ -546,118 +717,117 @@ class SchemaParser:
                 if using_clause:
                     index_desc += f" USING {using_clause}"
                 
-                full_table_name = f"{schema}.{table_name}" if schema != "public" else table_name
-                if full_table_name in self.tables:
-                    self.tables[full_table_name].indexes.append(index_desc)
+                table.indexes.append(index_desc)
         
         # Pattern 2: Handle USING method(expression) format where USING method directly precedes parentheses
-        index_pattern2 = (
-            r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:\w+\.)?(\w+)\s+"
-            r"ON\s+(?:ONLY\s+)?(?:(\w+)\.)?(\w+)\s+"
-            r"USING\s+(\w+)\("
-        )
-        matches2 = re.finditer(index_pattern2, sql, re.IGNORECASE | re.DOTALL)
+        matches2 = _match_at(_INDEX_USING_RE, sql, starts)
 
         for match in matches2:
             index_name = match.group(1)
             schema = match.group(2) or "public"
             table_name = match.group(3)
+            full_table_name = _qualified(schema, table_name)
+            table = self.tables.get(full_table_name)
+            if table is None:
+                continue
             using_clause = match.group(4)
             start_pos = match.end()  # Position after opening parenthesis after USING method
             
             # Extract expression with balanced parentheses
-            paren_depth = 1
-            i = start_pos
-            while i < len(sql) and paren_depth > 0:
-                if sql[i] == '(':
-                    paren_depth += 1
-                elif sql[i] == ')':
-                    paren_depth -= 1
-                i += 1
+            close_pos = _find_closing_paren(sql, start_pos)
             
-            if paren_depth == 0:
-                expression = sql[start_pos:i-1].strip()
+            if close_pos != -1:
+                expression = sql[start_pos:close_pos].strip()
                 
                 # Build index description
                 index_desc = f"{index_name} ({expression}) USING {using_clause}"
                 
-                full_table_name = f"{schema}.{table_name}" if schema != "public" else table_name
-                if full_table_name in self.tables:
-                    self.tables[full_table_name].indexes.append(index_desc)
+                table.indexes.append(index_desc)
 
-    def _parse_table_comments(self, sql: str) -> None:
-        """Parse COMMENT ON TABLE statements."""
-        comment_pattern = r"COMMENT\s+ON\s+TABLE\s+(?:(\w+)\.)?(\w+)\s+IS\s+'([^']+)'"
-        matches = re.finditer(comment_pattern, sql, re.IGNORECASE)
+    def _parse_table_comments(self, sql: str, starts: List[int]) -> None:
+        """Parse COMMENT ON TABLE statements beginning at the given offsets."""
+        matches = _match_at(_TABLE_COMMENT_RE, sql, starts)
 
         for match in matches:
             schema = match.group(1) or "public"
             table_name = match.group(2)
             comment = match.group(3)
 
-            full_table_name = f"{schema}.{table_name}" if schema != "public" else table_name
-            if full_table_name in self.tables:
-                self.tables[full_table_name].comment = comment
+            full_table_name = _qualified(schema, table_name)
+            table = self.tables.get(full_table_name)
+            if table is not None:
+                table.comment = comment
+
+
+# Regular expressions used by _make_anchor_id, compiled once at import time.
+_ANCHOR_CLEAN_RE = re.compile(r'[^\w\s-]')
+_ANCHOR_SEPARATOR_RE = re.compile(r'[\s._]+')
+_ANCHOR_DASHES_RE = re.compile(r'-+')
 
 
 def _make_anchor_id(text: str) -> str:
     """Convert text to a markdown/anchor-friendly ID."""
     # Convert to lowercase, replace spaces and dots with hyphens, remove special chars
-    import re
     anchor = text.lower()
-    anchor = re.sub(r'[^\w\s-]', '', anchor)  # Remove special chars except word chars, spaces, hyphens
-    anchor = re.sub(r'[\s._]+', '-', anchor)  # Replace spaces, dots, underscores with hyphens
-    anchor = re.sub(r'-+', '-', anchor)  # Collapse multiple hyphens
+    anchor = _ANCHOR_CLEAN_RE.sub('', anchor)  # Remove special chars except word chars, spaces, hyphens
+    anchor = _ANCHOR_SEPARATOR_RE.sub('-', anchor)  # Replace spaces, dots, underscores with hyphens
+    anchor = _ANCHOR_DASHES_RE.sub('-', anchor)  # Collapse multiple hyphens
     anchor = anchor.strip('-')  # Remove leading/trailing hyphens
     return anchor
 
 
-def _generate_plantuml_diagram(tables: Dict[str, Table]) -> List[str]:
-    """Generate PlantUML entity-relationship diagram showing parent-to-child relationships."""
-    lines = []
+def _iter_plantuml_diagram(tables: Dict[str, Table]) -> Iterator[str]:
+    """Yield the lines of a PlantUML entity-relationship diagram showing parent-to-child relationships."""
+    yield "@startuml"
+    yield "!theme plain"
+    yield "skinparam linetype ortho"
+    yield ""
     
-    lines.append("@startuml")
-    lines.append("!theme plain")
-    lines.append("skinparam linetype ortho")
-    lines.append("")
+    table_names = sorted(tables)
+    # Clean table names for PlantUML (remove schema prefix if present), computed once per name;
+    # with the prefix gone the name is also the entity id
+    entity_ids = {table_name: table_name.rpartition('.')[2] for table_name in table_names}
     
     # Define all entities (tables) with their primary keys
-    for table_name in sorted(tables.keys()):
+    for table_name in table_names:
         table = tables[table_name]
-        # Clean table name for PlantUML (remove schema prefix if present)
-        clean_name = table_name.split('.')[-1] if '.' in table_name else table_name
+        clean_name = entity_ids[table_name]
         
-        lines.append(f"entity \"{clean_name}\" as {clean_name.replace('.', '_')} {{")
+        yield f"entity \"{clean_name}\" as {clean_name} {{"
+        
+        # Index columns by name once; reversed so the first duplicate wins, like a linear scan
+        columns_by_name = {c.name: c for c in reversed(table.columns)}
         
         # Add primary key columns
         if table.primary_key_columns:
             for pk_col in table.primary_key_columns:
                 # Find the column to get its type
-                col = next((c for c in table.columns if c.name == pk_col), None)
+                col = columns_by_name.get(pk_col)
                 col_type = col.data_type if col else "INTEGER"
-                lines.append(f"  * {pk_col} : {col_type} <<PK>>")
+                yield f"  * {pk_col} : {col_type} <<PK>>"
         
         # Add foreign key columns (but not if they're already PKs)
         for fk in table.foreign_keys:
             for fk_col in fk.from_columns:
-                if fk_col not in table.primary_key_columns:
+                if fk_col not in table.primary_key_set:
                     # Find the column to get its type
-                    col = next((c for c in table.columns if c.name == fk_col), None)
+                    col = columns_by_name.get(fk_col)
                     col_type = col.data_type if col else "INTEGER"
-                    lines.append(f"  - {fk_col} : {col_type} <<FK>>")
+                    yield f"  - {fk_col} : {col_type} <<FK>>"
         
-        lines.append("}")
-        lines.append("")
+        yield "}"
+        yield ""
     
     # Define relationships
-    for table_name in sorted(tables.keys()):
+    for table_name in table_names:
         table = tables[table_name]
-        from_clean = table_name.split('.')[-1] if '.' in table_name else table_name
-        from_entity = from_clean.replace('.', '_')
+        from_entity = entity_ids[table_name]
         
         for fk in sorted(table.foreign_keys, key=lambda x: x.from_columns[0]):
-            to_clean = fk.to_table.split('.')[-1] if '.' in fk.to_table else fk.to_table
-            to_entity = to_clean.replace('.', '_')
+            to_entity = entity_ids.get(fk.to_table)
+            if to_entity is None:
+                # Referenced table outside the parsed set
+                to_entity = entity_ids[fk.to_table] = fk.to_table.rpartition('.')[2]
             
             from_cols = ", ".join(fk.from_columns)
             to_cols = ", ".join(fk.to_columns)
@@ -665,12 +835,15 @@ def _generate_plantuml_diagram(tables: Dict[str, Table]) -> List[str]:
             # Determine relationship cardinality
             # For now, use many-to-one (child to parent)
             # Format: Entity1 ||--o{ Entity2 (one-to-many from parent to child)
-            lines.append(f"{to_entity} ||--o{{ {from_entity} : \"{from_cols} → {to_cols}\"")
-    
-    lines.append("")
-    lines.append("@enduml")
+            yield f"{to_entity} ||--o{{ {from_entity} : \"{from_cols} → {to_cols}\""
     
-    return lines
+    yield ""
+    yield "@enduml"
+
+
+def _generate_plantuml_diagram(tables: Dict[str, Table]) -> List[str]:
+    """Generate PlantUML entity-relationship diagram showing parent-to-child relationships."""
+    return list(_iter_plantuml_diagram(tables))
 
 
 def _build_relationship_tree(tables: Dict[str, Table]) -> Dict[str, List[tuple]]:
@@ -698,40 +871,25 @@ def _build_relationship_tree(tables: Dict[str, Table]) -> Dict[str, List[tuple]]
     return tree
 
 
-def _generate_ascii_relationship_diagram(tables: Dict[str, Table]) -> List[str]:
-    """Generate ASCII art diagram showing parent-to-child relationships."""
-    lines = []
-    
+def _iter_ascii_relationship_diagram(tables: Dict[str, Table]) -> Iterator[str]:
+    """Yield the lines of an ASCII art diagram showing parent-to-child relationships."""
     # Build relationship tree
     tree = _build_relationship_tree(tables)
     
     if not tree:
-        lines.append("No relationships defined.")
-        return lines
+        yield "No relationships defined."
+        return
     
-    # Find all child tables (tables that reference other tables)
-    all_child_tables = set()
-    for children in tree.values():
-        for child_table, _ in children:
-            all_child_tables.add(child_table)
+    # Find all child tables in NON-self relationships (self-references don't make a table a child)
+    all_child_tables = {
+        child_table
+        for parent_table, children in tree.items()
+        for child_table, _ in children
+        if child_table != parent_table
+    }
     
     # Root tables are those that are parents but not children (in other relationships)
-    # This excludes self-references from being considered "children"
-    root_tables = []
-    for parent_table in sorted(tree.keys()):
-        # Check if this table is a child in any NON-self relationship
-        is_child = False
-        for other_parent, children_list in tree.items():
-            if other_parent != parent_table:  # Exclude self-references
-                for child_table, _ in children_list:
-                    if child_table == parent_table:
-                        is_child = True
-                        break
-                if is_child:
-                    break
-        
-        if not is_child:
-            root_tables.append(parent_table)
+    root_tables = [parent_table for parent_table in sorted(tree.keys()) if parent_table not in all_child_tables]
     
     # If no clear roots found, use all parent tables as roots
     if not root_tables:
@@ -752,233 +910,231 @@ def _generate_ascii_relationship_diagram(tables: Dict[str, Table]) -> List[str]:
         else:
             return prefix + "├── "
     
-    def draw_relationships(parent: str, visited: set, prefix: str = "", is_last: bool = True, depth: int = 0, show_table_name: bool = True):
-        """Recursively draw relationships from a parent table.
+    def children_frame(parent: str, prefix: str, connector_prefix: str) -> tuple:
+        """Stack frame for drawing a table's children; children are sorted for consistent output.
         
-        Args:
-            parent: Table name to draw
-            visited: Set of already visited tables (to avoid cycles)
-            prefix: String prefix for indentation
-            is_last: Whether this is the last child in its parent's list
-            depth: Current depth in the tree
-            show_table_name: Whether to show the table name (False when already shown in branch)
+        The prefixes for the last child's subtree and for its siblings' subtrees are
+        built once here rather than for every child.
         """
-        if parent not in tables:
-            return
-        
-        if parent in visited and depth > 0:
-            # Show reference but don't recurse to avoid infinite loops (self-references)
-            # Don't show table name again, just the reference
-            return
-        
-        visited.add(parent)
+        children = sorted(tree.get(parent, ()), key=lambda x: x[0])
+        return (parent, prefix + "    ", prefix + "│   ", connector_prefix, children, enumerate(children))
+    
+    def draw_relationships(root: str) -> Iterator[str]:
+        """Draw the relationships below a root table, depth first.
         
-        # Draw the parent table name if needed
-        if show_table_name:
-            table_line = draw_table_name(parent, prefix)
-            lines.append(table_line)
+        Walks an explicit stack of frames instead of recursing, so long FK chains
+        cannot hit the recursion limit. Every table's name is drawn before its frame
+        is pushed, and each frame carries the connector prefix for its branches.
+        `path` holds the tables on the current branch (added on push, removed on pop)
+        and stops cycles from being descended into again.
+        """
+        yield draw_table_name(root)
+        path = {root}
+        # Branches of a root are indented one level below its name
+        stack = [children_frame(root, "", "    ")]
         
-        # Get children
-        if parent in tree:
-            children = tree[parent]
-            # Sort children for consistent output
-            children = sorted(children, key=lambda x: x[0])
+        while stack:
+            parent, last_prefix, cont_prefix, connector_prefix, children, remaining = stack[-1]
+            next_child = next(remaining, None)
+            if next_child is None:
+                stack.pop()
+                path.discard(parent)
+                continue
             
-            for idx, (child_table, fk_info) in enumerate(children):
-                is_last_child = (idx == len(children) - 1)
-                
-                # Determine prefix for connectors
-                if is_last and not show_table_name:
-                    # If parent wasn't shown, adjust prefix
-                    connector_prefix = prefix
-                    child_prefix = prefix
-                elif is_last:
-                    connector_prefix = prefix + "    "
-                    child_prefix = prefix + "    "
-                else:
-                    connector_prefix = prefix + "│   "
-                    child_prefix = prefix + "│   "
-                
-                # Check if child has children
-                child_has_children = child_table in tree and tree[child_table]
-                
-                # Determine prefix for child's children
-                if is_last_child:
-                    new_prefix = prefix + "    "
-                else:
-                    new_prefix = prefix + "│   "
-                
-                # Check if this is a self-reference
-                is_self_ref = (child_table == parent)
-                
-                # Show branch with table name and FK relationship
-                branch = draw_branch_connector(is_last_child, connector_prefix)
-                from_cols = ", ".join(fk_info['from_cols'])
-                to_cols = ", ".join(fk_info['to_cols'])
-                branch += f"{child_table} ({from_cols} → {to_cols})"
-                lines.append(branch)
-                
-                # Handle self-references
-                if is_self_ref:
-                    # For self-references, show "... (see above)" and don't recurse
-                    lines.append(new_prefix + "... (see above)")
-                elif child_has_children:
-                    # If child has children, show it as a parent table and then its children
-                    child_table_line = draw_table_name(child_table, new_prefix)
-                    lines.append(child_table_line)
-                    # Recursively draw child relationships
-                    draw_relationships(child_table, visited.copy(), new_prefix, is_last_child, depth + 1, show_table_name=False)
+            idx, (child_table, fk_info) = next_child
+            is_last_child = (idx == len(children) - 1)
+            
+            # Determine prefix for child's children
+            new_prefix = last_prefix if is_last_child else cont_prefix
+            
+            # Show branch with table name and FK relationship
+            branch = draw_branch_connector(is_last_child, connector_prefix)
+            from_cols = ", ".join(fk_info['from_cols'])
+            to_cols = ", ".join(fk_info['to_cols'])
+            yield f"{branch}{child_table} ({from_cols} → {to_cols})"
+            
+            if child_table == parent:
+                # For self-references, show "... (see above)" and don't descend
+                yield new_prefix + "... (see above)"
+            elif tree.get(child_table):
+                # If child has children, show it as a parent table and then its children
+                yield draw_table_name(child_table, new_prefix)
+                # Tables already on the branch are referenced but not expanded again
+                if child_table in tables and child_table not in path:
+                    path.add(child_table)
+                    # Below a last child the branches hang straight off its prefix
+                    child_connector = new_prefix if is_last_child else new_prefix + "│   "
+                    stack.append(children_frame(child_table, new_prefix, child_connector))
     
     # Draw from root tables
     for idx, root in enumerate(root_tables):
         if root in tables:
-            draw_relationships(root, set(), "", True, 0)
+            yield from draw_relationships(root)
             if idx < len(root_tables) - 1:
-                lines.append("")  # Space between root trees
+                yield ""  # Space between root trees
     
     # Remove the collect_shown code - it's not needed and causes recursion issues
     # The draw_relationships function already handles showing all tables
     
     # Show orphan tables (tables with no relationships)
-    all_connected = set()
-    for parent in tree.keys():
-        all_connected.add(parent)
-        for child, _ in tree[parent]:
-            all_connected.add(child)
+    # Self-referencing children are parents too, so the child set from root detection covers the rest
+    all_connected = all_child_tables.union(tree)
     
     orphan_tables = [t for t in sorted(tables.keys()) if t not in all_connected]
     if orphan_tables:
-        lines.append("")
-        lines.append("Standalone tables (no relationships):")
+        yield ""
+        yield "Standalone tables (no relationships):"
         for table in orphan_tables:
-            lines.append(table)
-    
-    return lines
+            yield table
 
 
-def generate_documentation(tables: Dict[str, Table], output_file: Optional[Path] = None) -> str:
-    """Generate markdown documentation for the schema."""
-    lines = []
+def _generate_ascii_relationship_diagram(tables: Dict[str, Table]) -> List[str]:
+    """Generate ASCII art diagram showing parent-to-child relationships."""
+    return list(_iter_ascii_relationship_diagram(tables))
+
+
+def _sorted_relationships(items: List[Tuple[str, Table]]) -> List[ForeignKey]:
+    """Return every foreign key for the relationships summary, in table order."""
+    return [
+        fk
+        for _, table in items
+        for fk in sorted(table.foreign_keys, key=lambda x: x.from_columns[0])
+    ]
+
+
+def _iter_markdown(tables: Dict[str, Table]) -> Iterator[str]:
+    """Yield the markdown documentation for the schema in pieces."""
+    # Sorted once and shared by every section below
+    items = [(name, tables[name]) for name in sorted(tables)]
     
-    lines.append("# Database Schema Documentation\n")
+    yield "# Database Schema Documentation\n\n"
     
     # Entity Overview with anchor - use HTML heading with ID for better markdown compatibility
-    lines.append('<h2 id="table-list">Entity Overview</h2>\n')
-    lines.append(f"This schema contains **{len(tables)}** table(s):\n")
-    for table_name in sorted(tables.keys()):
-        table = tables[table_name]
+    yield '<h2 id="table-list">Entity Overview</h2>\n\n'
+    yield f"This schema contains **{len(tables)}** table(s):\n\n"
+    for table_name, table in items:
         pk_info = f" (PK: {', '.join(table.primary_key_columns)})" if table.primary_key_columns else ""
         anchor_id = _make_anchor_id(table_name)
-        lines.append(f"- [`{table_name}`](#{anchor_id}){pk_info}")
-    lines.append("")
+        yield f"- [`{table_name}`](#{anchor_id}){pk_info}\n"
+    yield "\n"
 
     # Detailed Table Information
-    lines.append("## Tables\n")
-    for table_name in sorted(tables.keys()):
-        table = tables[table_name]
+    yield "## Tables\n\n"
+    for table_name, table in items:
         anchor_id = _make_anchor_id(table_name)
         # Add anchor before heading for markdown compatibility
-        lines.append(f'<a name="{anchor_id}"></a>\n')
-        lines.append(f"### {table_name}\n")
+        yield f'<a name="{anchor_id}"></a>\n\n'
+        yield f"### {table_name}\n\n"
         
         # Add back to table list link
-        lines.append(f"[↑ Back to Table List](#table-list)\n")
-        lines.append("")
+        yield "[↑ Back to Table List](#table-list)\n\n"
+        yield "\n"
 
         if table.comment:
-            lines.append(f"*{table.comment}*\n")
+            yield f"*{table.comment}*\n\n"
 
-        lines.append("**Columns:**\n")
-        lines.append("| Column Name | Data Type | Nullable | Default | Constraints | Eng Source | Source Field |")
-        lines.append("|-------------|-----------|----------|---------|-------------|-----------|-------------|")
+        yield "**Columns:**\n\n"
+        yield "| Column Name | Data Type | Nullable | Default | Constraints | Eng Source | Source Field |\n"
+        yield "|-------------|-----------|----------|---------|-------------|-----------|-------------|\n"
 
+        pk_set = table.primary_key_set
+        column_checks = []  # Gathered while emitting rows instead of walking the columns again
         for col in table.columns:
+            for check_expr in col.check_constraints:
+                column_checks.append((col.name, check_expr))
             constraints = []
-            if col.name in table.primary_key_columns:
+            is_pk = col.name in pk_set
+            if is_pk:
                 constraints.append("PK")
             if col.is_unique:
                 constraints.append("UNIQUE")
-            if not col.is_nullable and col.name not in table.primary_key_columns:
+            if not col.is_nullable and not is_pk:
                 constraints.append("NOT NULL")
 
             constraints_str = ", ".join(constraints) if constraints else "-"
             nullable = "No" if not col.is_nullable else "Yes"
             default = col.default_value or "-"
 
-            lines.append(
-                f"| `{col.name}` | `{col.data_type}` | {nullable} | {default} | {constraints_str} | - | - |"
-            )
+            yield f"| `{col.name}` | `{col.data_type}` | {nullable} | {default} | {constraints_str} | - | - |\n"
 
-        lines.append("")
+        yield "\n"
 
         # Display column-level CHECK constraints
-        has_column_checks = any(col.check_constraints for col in table.columns)
-        if has_column_checks:
-            lines.append("**Column CHECK Constraints:**\n")
-            for col in table.columns:
-                if col.check_constraints:
-                    for check_expr in col.check_constraints:
-                        lines.append(f"- `{col.name}`: `{check_expr}`")
-            lines.append("")
+        if column_checks:
+            yield "**Column CHECK Constraints:**\n\n"
+            for col_name, check_expr in column_checks:
+                yield f"- `{col_name}`: `{check_expr}`\n"
+            yield "\n"
 
         # Display table-level CHECK constraints
         if table.check_constraints:
-            lines.append("**Table CHECK Constraints:**\n")
+            yield "**Table CHECK Constraints:**\n\n"
             for check_constraint in table.check_constraints:
                 if check_constraint.name:
-                    lines.append(f"- `{check_constraint.name}`: `{check_constraint.expression}`")
+                    yield f"- `{check_constraint.name}`: `{check_constraint.expression}`\n"
                 else:
-                    lines.append(f"- `{check_constraint.expression}`")
-            lines.append("")
+                    yield f"- `{check_constraint.expression}`\n"
+            yield "\n"
 
         # Foreign Keys
         if table.foreign_keys:
-            lines.append("**Foreign Keys:**\n")
+            yield "**Foreign Keys:**\n\n"
             for fk in table.foreign_keys:
                 from_cols = ", ".join(fk.from_columns)
                 to_cols = ", ".join(fk.to_columns)
-                lines.append(
+                yield (
                     f"- `{from_cols}` → `{fk.to_table}.{to_cols}` "
-                    f"(constraint: `{fk.constraint_name}`)"
+                    f"(constraint: `{fk.constraint_name}`)\n"
                 )
-            lines.append("")
+            yield "\n"
 
         # Indexes
         if table.indexes:
-            lines.append("**Indexes:**\n")
+            yield "**Indexes:**\n\n"
             for idx in table.indexes:
-                lines.append(f"- `{idx}`")
-            lines.append("")
+                yield f"- `{idx}`\n"
+            yield "\n"
 
-        lines.append("---\n")
+        yield "---\n\n"
 
     # Relationships Summary
-    lines.append("## Relationships\n")
-    if not any(table.foreign_keys for table in tables.values()):
-        lines.append("No foreign key relationships defined.\n")
+    yield "## Relationships\n\n"
+    relationships = _sorted_relationships(items)
+    if not relationships:
+        yield "No foreign key relationships defined.\n"
     else:
-        lines.append("### Foreign Key Relationships\n")
-        lines.append("| From Table | From Columns | To Table | To Columns |")
-        lines.append("|------------|--------------|----------|------------|")
+        yield "### Foreign Key Relationships\n\n"
+        yield "| From Table | From Columns | To Table | To Columns |\n"
+        yield "|------------|--------------|----------|------------|\n"
 
-        for table_name in sorted(tables.keys()):
-            table = tables[table_name]
-            for fk in sorted(table.foreign_keys, key=lambda x: x.from_columns[0]):
-                from_cols = ", ".join(fk.from_columns)
-                to_cols = ", ".join(fk.to_columns)
-                lines.append(f"| `{fk.from_table}` | `{from_cols}` | `{fk.to_table}` | `{to_cols}` |")
+        for fk in relationships:
+            from_cols = ", ".join(fk.from_columns)
+            to_cols = ", ".join(fk.to_columns)
+            yield f"| `{fk.from_table}` | `{from_cols}` | `{fk.to_table}` | `{to_cols}` |\n"
 
-        lines.append("")
 
-    doc = "\n".join(lines)
+def generate_documentation(tables: Dict[str, Table], output_file: Optional[Path] = None) -> str:
+    """Generate markdown documentation for the schema."""
+    doc = "".join(_iter_markdown(tables))
     if output_file:
         output_file.parent.mkdir(parents=True, exist_ok=True)
         output_file.write_text(doc, encoding="utf-8")
     return doc
 
 
+def write_documentation(tables: Dict[str, Table], output_file: Path) -> None:
+    """Stream markdown documentation to output_file without holding the whole document."""
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with output_file.open("w", encoding="utf-8", buffering=1 << 20) as out:
+        out.writelines(_iter_markdown(tables))
+
+
+@lru_cache(maxsize=4096)
 def escape_html(text: str) -> str:
-    """Escape HTML special characters."""
+    """Escape HTML special characters.
+    
+    Memoized: the same table, column and type names are escaped many times per document.
+    """
     return (text
             .replace("&", "&amp;")
             .replace("<", "&lt;")
@@ -987,72 +1143,68 @@ def escape_html(text: str) -> str:
             .replace("'", "&#39;"))
 
 
-def generate_confluence_documentation(tables: Dict[str, Table], output_file: Optional[Path] = None) -> str:
-    """Generate Confluence-compatible HTML documentation for the schema.
-    
-    The output is HTML that can be directly pasted into Confluence:
-    1. Copy the entire HTML content
-    2. In Confluence, click Edit
-    3. Click the 'Insert' menu → 'Markup'
-    4. Select 'HTML' and paste the content
-    Alternatively, some Confluence versions allow pasting HTML directly.
-    """
-    lines = []
+def _iter_confluence(tables: Dict[str, Table]) -> Iterator[str]:
+    """Yield the Confluence HTML documentation for the schema in pieces."""
+    # Sorted once and shared by every section below
+    items = [(name, tables[name]) for name in sorted(tables)]
     
     # Wrap in a div for better Confluence compatibility
-    lines.append('<div class="confluence-content">')
-    lines.append('')
+    yield '<div class="confluence-content">\n'
+    yield '\n'
     
     # Title
-    lines.append('<h1>Database Schema Documentation</h1>')
-    lines.append('')
+    yield '<h1>Database Schema Documentation</h1>\n'
+    yield '\n'
     
     # Entity Overview with anchor
-    lines.append('<h2 id="table-list">Entity Overview</h2>')
-    lines.append(f'<p>This schema contains <strong>{len(tables)}</strong> table(s):</p>')
-    lines.append('<ul>')
-    for table_name in sorted(tables.keys()):
-        table = tables[table_name]
+    yield '<h2 id="table-list">Entity Overview</h2>\n'
+    yield f'<p>This schema contains <strong>{len(tables)}</strong> table(s):</p>\n'
+    yield '<ul>\n'
+    for table_name, table in items:
         pk_info = f' <em>(PK: {", ".join(table.primary_key_columns)})</em>' if table.primary_key_columns else ""
         table_name_escaped = escape_html(table_name)
         anchor_id = _make_anchor_id(table_name)
-        lines.append(f'<li><a href="#{anchor_id}"><code>{table_name_escaped}</code></a>{pk_info}</li>')
-    lines.append('</ul>')
-    lines.append('')
+        yield f'<li><a href="#{anchor_id}"><code>{table_name_escaped}</code></a>{pk_info}</li>\n'
+    yield '</ul>\n'
+    yield '\n'
     
     # Detailed Table Information
-    lines.append('<h2>Tables</h2>')
-    for table_name in sorted(tables.keys()):
-        table = tables[table_name]
+    yield '<h2>Tables</h2>\n'
+    for table_name, table in items:
         table_name_escaped = escape_html(table_name)
         anchor_id = _make_anchor_id(table_name)
-        lines.append(f'<h3 id="{anchor_id}">{table_name_escaped}</h3>')
-        lines.append('')
+        yield f'<h3 id="{anchor_id}">{table_name_escaped}</h3>\n'
+        yield '\n'
         
         # Add back to table list link
-        lines.append('<p>')
-        lines.append(f'<a href="#table-list">↑ Back to Table List</a>')
-        lines.append('</p>')
-        lines.append('')
+        yield '<p>\n'
+        yield f'<a href="#table-list">↑ Back to Table List</a>\n'
+        yield '</p>\n'
+        yield '\n'
         
         if table.comment:
             comment_escaped = escape_html(table.comment)
-            lines.append(f'<p><em>{comment_escaped}</em></p>')
-            lines.append('')
+            yield f'<p><em>{comment_escaped}</em></p>\n'
+            yield '\n'
         
         # Columns table
-        lines.append('<p><strong>Columns:</strong></p>')
-        lines.append('<table class="confluenceTable">')
-        lines.append('<tbody>')
-        lines.append('<tr><th class="confluenceTh">Column Name</th><th class="confluenceTh">Data Type</th><th class="confluenceTh">Nullable</th><th class="confluenceTh">Default</th><th class="confluenceTh">Constraints</th><th class="confluenceTh">Eng Source</th><th class="confluenceTh">Source Field</th></tr>')
+        yield '<p><strong>Columns:</strong></p>\n'
+        yield '<table class="confluenceTable">\n'
+        yield '<tbody>\n'
+        yield '<tr><th class="confluenceTh">Column Name</th><th class="confluenceTh">Data Type</th><th class="confluenceTh">Nullable</th><th class="confluenceTh">Default</th><th class="confluenceTh">Constraints</th><th class="confluenceTh">Eng Source</th><th class="confluenceTh">Source Field</th></tr>\n'
         
+        pk_set = table.primary_key_set
+        column_checks = []  # Gathered while emitting rows instead of walking the columns again
         for col in table.columns:
+            for check_expr in col.check_constraints:
+                column_checks.append((col.name, check_expr))
             constraints = []
-            if col.name in table.primary_key_columns:
+            is_pk = col.name in pk_set
+            if is_pk:
                 constraints.append("PK")
             if col.is_unique:
                 constraints.append("UNIQUE")
-            if not col.is_nullable and col.name not in table.primary_key_columns:
+            if not col.is_nullable and not is_pk:
                 constraints.append("NOT NULL")
             
             constraints_str = ", ".join(constraints) if constraints else "-"
@@ -1063,7 +1215,7 @@ def generate_confluence_documentation(tables: Dict[str, Table], output_file: Opt
             data_type_escaped = escape_html(col.data_type)
             constraints_escaped = escape_html(constraints_str)
             
-            lines.append(
+            yield (
                 f'<tr>'
                 f'<td class="confluenceTd"><code>{col_name_escaped}</code></td>'
                 f'<td class="confluenceTd"><code>{data_type_escaped}</code></td>'
@@ -1072,46 +1224,43 @@ def generate_confluence_documentation(tables: Dict[str, Table], output_file: Opt
                 f'<td class="confluenceTd">{constraints_escaped}</td>'
                 f'<td class="confluenceTd">-</td>'
                 f'<td class="confluenceTd">-</td>'
-                f'</tr>'
+                f'</tr>\n'
             )
         
-        lines.append('</tbody>')
-        lines.append('</table>')
-        lines.append('')
+        yield '</tbody>\n'
+        yield '</table>\n'
+        yield '\n'
         
         # Column-level CHECK constraints
-        has_column_checks = any(col.check_constraints for col in table.columns)
-        if has_column_checks:
-            lines.append('<p><strong>Column CHECK Constraints:</strong></p>')
-            lines.append('<ul>')
-            for col in table.columns:
-                if col.check_constraints:
-                    for check_expr in col.check_constraints:
-                        col_name_escaped = escape_html(col.name)
-                        check_expr_escaped = escape_html(check_expr)
-                        lines.append(f'<li><code>{col_name_escaped}</code>: <code>{check_expr_escaped}</code></li>')
-            lines.append('</ul>')
-            lines.append('')
+        if column_checks:
+            yield '<p><strong>Column CHECK Constraints:</strong></p>\n'
+            yield '<ul>\n'
+            for col_name, check_expr in column_checks:
+                col_name_escaped = escape_html(col_name)
+                check_expr_escaped = escape_html(check_expr)
+                yield f'<li><code>{col_name_escaped}</code>: <code>{check_expr_escaped}</code></li>\n'
+            yield '</ul>\n'
+            yield '\n'
         
         # Table-level CHECK constraints
         if table.check_constraints:
-            lines.append('<p><strong>Table CHECK Constraints:</strong></p>')
-            lines.append('<ul>')
+            yield '<p><strong>Table CHECK Constraints:</strong></p>\n'
+            yield '<ul>\n'
             for check_constraint in table.check_constraints:
                 if check_constraint.name:
                     name_escaped = escape_html(check_constraint.name)
                     expr_escaped = escape_html(check_constraint.expression)
-                    lines.append(f'<li><code>{name_escaped}</code>: <code>{expr_escaped}</code></li>')
+                    yield f'<li><code>{name_escaped}</code>: <code>{expr_escaped}</code></li>\n'
                 else:
                     expr_escaped = escape_html(check_constraint.expression)
-                    lines.append(f'<li><code>{expr_escaped}</code></li>')
-            lines.append('</ul>')
-            lines.append('')
+                    yield f'<li><code>{expr_escaped}</code></li>\n'
+            yield '</ul>\n'
+            yield '\n'
         
         # Foreign Keys
         if table.foreign_keys:
-            lines.append('<p><strong>Foreign Keys:</strong></p>')
-            lines.append('<ul>')
+            yield '<p><strong>Foreign Keys:</strong></p>\n'
+            yield '<ul>\n'
             for fk in table.foreign_keys:
                 from_cols = ", ".join(fk.from_columns)
                 to_cols = ", ".join(fk.to_columns)
@@ -1119,70 +1268,87 @@ def generate_confluence_documentation(tables: Dict[str, Table], output_file: Opt
                 to_table_escaped = escape_html(fk.to_table)
                 to_cols_escaped = escape_html(to_cols)
                 constraint_name_escaped = escape_html(fk.constraint_name)
-                lines.append(
+                yield (
                     f'<li><code>{from_cols_escaped}</code> → '
                     f'<code>{to_table_escaped}.{to_cols_escaped}</code> '
-                    f'(constraint: <code>{constraint_name_escaped}</code>)</li>'
+                    f'(constraint: <code>{constraint_name_escaped}</code>)</li>\n'
                 )
-            lines.append('</ul>')
-            lines.append('')
+            yield '</ul>\n'
+            yield '\n'
         
         # Indexes
         if table.indexes:
-            lines.append('<p><strong>Indexes:</strong></p>')
-            lines.append('<ul>')
+            yield '<p><strong>Indexes:</strong></p>\n'
+            yield '<ul>\n'
             for idx in table.indexes:
                 idx_escaped = escape_html(idx)
-                lines.append(f'<li><code>{idx_escaped}</code></li>')
-            lines.append('</ul>')
-            lines.append('')
+                yield f'<li><code>{idx_escaped}</code></li>\n'
+            yield '</ul>\n'
+            yield '\n'
         
-        lines.append('<hr>')
-        lines.append('')
+        yield '<hr>\n'
+        yield '\n'
     
     # Relationships Summary
-    lines.append('<h2>Relationships</h2>')
-    if not any(table.foreign_keys for table in tables.values()):
-        lines.append('<p>No foreign key relationships defined.</p>')
+    yield '<h2>Relationships</h2>\n'
+    relationships = _sorted_relationships(items)
+    if not relationships:
+        yield '<p>No foreign key relationships defined.</p>\n'
     else:
-        lines.append('<h3>Foreign Key Relationships</h3>')
-        lines.append('<table class="confluenceTable">')
-        lines.append('<tbody>')
-        lines.append('<tr><th class="confluenceTh">From Table</th><th class="confluenceTh">From Columns</th><th class="confluenceTh">To Table</th><th class="confluenceTh">To Columns</th></tr>')
+        yield '<h3>Foreign Key Relationships</h3>\n'
+        yield '<table class="confluenceTable">\n'
+        yield '<tbody>\n'
+        yield '<tr><th class="confluenceTh">From Table</th><th class="confluenceTh">From Columns</th><th class="confluenceTh">To Table</th><th class="confluenceTh">To Columns</th></tr>\n'
         
-        for table_name in sorted(tables.keys()):
-            table = tables[table_name]
-            for fk in sorted(table.foreign_keys, key=lambda x: x.from_columns[0]):
-                from_cols = ", ".join(fk.from_columns)
-                to_cols = ", ".join(fk.to_columns)
-                from_table_escaped = escape_html(fk.from_table)
-                from_cols_escaped = escape_html(from_cols)
-                to_table_escaped = escape_html(fk.to_table)
-                to_cols_escaped = escape_html(to_cols)
-                
-                lines.append(
-                    f'<tr>'
-                    f'<td class="confluenceTd"><code>{from_table_escaped}</code></td>'
-                    f'<td class="confluenceTd"><code>{from_cols_escaped}</code></td>'
-                    f'<td class="confluenceTd"><code>{to_table_escaped}</code></td>'
-                    f'<td class="confluenceTd"><code>{to_cols_escaped}</code></td>'
-                    f'</tr>'
-                )
+        for fk in relationships:
+            from_cols = ", ".join(fk.from_columns)
+            to_cols = ", ".join(fk.to_columns)
+            from_table_escaped = escape_html(fk.from_table)
+            from_cols_escaped = escape_html(from_cols)
+            to_table_escaped = escape_html(fk.to_table)
+            to_cols_escaped = escape_html(to_cols)
+            
+            yield (
+                f'<tr>'
+                f'<td class="confluenceTd"><code>{from_table_escaped}</code></td>'
+                f'<td class="confluenceTd"><code>{from_cols_escaped}</code></td>'
+                f'<td class="confluenceTd"><code>{to_table_escaped}</code></td>'
+                f'<td class="confluenceTd"><code>{to_cols_escaped}</code></td>'
+                f'</tr>\n'
+            )
         
-        lines.append('</tbody>')
-        lines.append('</table>')
-        lines.append('')
+        yield '</tbody>\n'
+        yield '</table>\n'
+        yield '\n'
     
     # Close the wrapper div
-    lines.append('</div>')
+    yield '</div>'
+
+
+def generate_confluence_documentation(tables: Dict[str, Table], output_file: Optional[Path] = None) -> str:
+    """Generate Confluence-compatible HTML documentation for the schema.
     
-    doc = "\n".join(lines)
+    The output is HTML that can be directly pasted into Confluence:
+    1. Copy the entire HTML content
+    2. In Confluence, click Edit
+    3. Click the 'Insert' menu → 'Markup'
+    4. Select 'HTML' and paste the content
+    Alternatively, some Confluence versions allow pasting HTML directly.
+    """
+    doc = "".join(_iter_confluence(tables))
     if output_file:
         output_file.parent.mkdir(parents=True, exist_ok=True)
         output_file.write_text(doc, encoding="utf-8")
     return doc
 
 
+def write_confluence_documentation(tables: Dict[str, Table], output_file: Path) -> None:
+    """Stream Confluence HTML documentation to output_file without holding the whole document."""
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with output_file.open("w", encoding="utf-8", buffering=1 << 20) as out:
+        out.writelines(_iter_confluence(tables))
+
+
 def parse_args() -> argparse.Namespace:
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
@@ -1205,25 +1371,40 @@ def parse_args() -> argparse.Namespace:
         default="markdown",
         help="Output format for documentation (default: markdown). Use 'confluence' for Confluence-compatible HTML.",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of worker processes for parsing table definitions (default: 1, parse serially). Worth raising only for very large schemas.",
+    )
     return parser.parse_args()
 
 
+def _write_stdout(pieces: Iterable[str]) -> None:
+    """Write a document to stdout piece by piece, ending it with a newline like print()."""
+    sys.stdout.writelines(pieces)
+    sys.stdout.write("\n")
+
+
 def main() -> None:
     """Main entry point."""
     args = parse_args()
 
     try:
-        parser = SchemaParser(args.sql_file)
+        parser = SchemaParser(args.sql_file, jobs=args.jobs)
         tables = parser.parse()
 
         if args.format == "markdown":
-            doc = generate_documentation(tables, args.output)
-            if not args.output:
-                print(doc)
+            if args.output:
+                write_documentation(tables, args.output)
+            else:
+                _write_stdout(_iter_markdown(tables))
         elif args.format == "confluence":
-            doc = generate_confluence_documentation(tables, args.output)
-            if not args.output:
-                print(doc)
+            if args.output:
+                write_confluence_documentation(tables, args.output)
+            else:
+                _write_stdout(_iter_confluence(tables))
         else:
             # Simple text format
             lines = [f"Database Schema: {len(tables)} tables\n", "=" * 50, ""]
@@ -1233,9 +1414,10 @@ def main() -> None:
                 if table.comment:
                     lines.append(f"  Comment: {table.comment}")
                 lines.append(f"  Columns ({len(table.columns)}):")
+                pk_set = table.primary_key_set
                 for col in table.columns:
                     constraints = []
-                    if col.name in table.primary_key_columns:
+                    if col.name in pk_set:
                         constraints.append("PK")
                     if not col.is_nullable:
                         constraints.append("NOT NULL")
@@ -1254,7 +1436,7 @@ def main() -> None:
                 args.output.parent.mkdir(parents=True, exist_ok=True)
                 args.output.write_text(doc, encoding="utf-8")
             else:
-                print(doc)
+                _write_stdout((doc,))
 
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -1,17 +1,35 @@
 import yaml
 import sys
 import subprocess
+import hashlib
+import os
+import pickle
+from functools import lru_cache
 from pathlib import Path
 import re
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml bindings not available
+    from yaml import SafeLoader
+
+# Set to "0" to disable the parsed-YAML cache.
+CACHE_ENV_VAR = "INFRA_YAML_CACHE"
+
 # ============ Helpers ============
 
+_ALIAS_UNSAFE_RE = re.compile(r"[^A-Za-z0-9_]")
+
+
+@lru_cache(maxsize=4096)
 def safe_alias(name: str) -> str:
-    return re.sub(r"[^A-Za-z0-9_]", "_", name)
+    # Memoized: the same names are aliased once per layer and again per relationship
+    return _ALIAS_UNSAFE_RE.sub("_", name)
 
 
 def q(s: str) -> str:
-    return s.replace('"', '\\"')
+    # Most labels have no quotes; the membership test is cheaper than a replace call
+    return s if '"' not in s else s.replace('"', '\\"')
 
 
 def overcommit(allocated: float, capacity: float):
@@ -20,6 +38,16 @@ def overcommit(allocated: float, capacity: float):
     return allocated, f"{(allocated / capacity) * 100:.1f}%"
 
 
+def write_puml(puml_file: Path, lines) -> None:
+    # Same bytes as write_text("\n".join(lines)), without holding the whole diagram in memory
+    with puml_file.open("w", encoding="utf-8", buffering=1 << 20) as fh:
+        lines = iter(lines)
+        fh.write(next(lines, ""))
+        for line in lines:
+            fh.write("\n")
+            fh.write(line)
+
+
 def render_file(puml_file: Path, formats=("png", "svg")):
     for fmt in formats:
         try:
@@ -32,9 +60,39 @@ def render_file(puml_file: Path, formats=("png", "svg")):
             print(f"[WARN] PlantUML failed for {puml_file}: {e}")
 
 
+def render_files(puml_files, formats=("png", "svg")):
+    # One plantuml run per format for all files, so the JVM starts once per format rather than per diagram
+    if not puml_files:
+        return
+    for fmt in formats:
+        try:
+            print(f"[INFO] Rendering {fmt.upper()} for {len(puml_files)} diagram(s)")
+            subprocess.run(["plantuml", f"-t{fmt}", *(str(f) for f in puml_files)], check=True)
+        except FileNotFoundError:
+            print("[WARN] 'plantuml' not found on PATH – skipping rendering.")
+            break
+        except subprocess.CalledProcessError as e:
+            print(f"[WARN] PlantUML failed for one or more diagrams: {e}")
+
+
+# ============ Application domain colors ============
+# Shared by the topology and microservice diagrams; main builds it once per site
+
+DEFAULT_APP_COLORS = ["#CCE5FF", "#FFDDBB", "#E0E0E0", "#D4EDDA", "#F7D7E0"]
+
+
+def build_domain_colors(applications) -> dict:
+    domain_colors = {}
+    for app in applications:
+        domain = app.get("domain", "general")
+        if domain not in domain_colors:
+            domain_colors[domain] = DEFAULT_APP_COLORS[len(domain_colors) % len(DEFAULT_APP_COLORS)]
+    return domain_colors
+
+
 # ============ Topology (Networks + Compute + Storage + Apps + Security) ============
 
-def generate_topology_puml(site: dict) -> str:
+def iter_topology_puml(site: dict, domain_colors: dict | None = None):
     nets = site.get("networks", [])
     hv_list = site.get("hypervisors", [])
     storage_pools = site.get("storage_pools", [])
@@ -43,63 +101,56 @@ def generate_topology_puml(site: dict) -> str:
     databases = site.get("databases", [])
 
     # Application domain colors
-    domain_colors = {}
-    default_app_colors = ["#CCE5FF", "#FFDDBB", "#E0E0E0", "#D4EDDA", "#F7D7E0"]
-    dc_index = 0
-    for app in applications:
-        domain = app.get("domain", "general")
-        if domain not in domain_colors:
-            domain_colors[domain] = default_app_colors[dc_index % len(default_app_colors)]
-            dc_index += 1
+    if domain_colors is None:
+        domain_colors = build_domain_colors(applications)
 
-    lines = []
-    lines.append("@startuml")
-    lines.append(f"title Topology – {site['name']}")
-    lines.append("skinparam shadowing false")
-    lines.append("skinparam defaultTextAlignment left")
-    lines.append("skinparam packageStyle rectangle")
+    yield "@startuml"
+    yield f"title Topology – {site['name']}"
+    yield "skinparam shadowing false"
+    yield "skinparam defaultTextAlignment left"
+    yield "skinparam packageStyle rectangle"
 
     # -------- LEGEND --------
-    lines.append("legend left")
-    lines.append("== Hypervisor Colors ==")
+    yield "legend left"
+    yield "== Hypervisor Colors =="
     for hv in hv_list:
         if "color" in hv:
-            lines.append(f"|<back:{hv['color']}> {hv['name']} </back>| {hv['color']} |")
+            yield f"|<back:{hv['color']}> {hv['name']} </back>| {hv['color']} |"
 
     if nets:
-        lines.append("== Network Roles ==")
+        yield "== Network Roles =="
         seen_roles = set()
         for n in nets:
             r = n.get("role")
             if r and r not in seen_roles:
                 seen_roles.add(r)
-                lines.append(f"| {r} | VLAN {n.get('vlan','')} | {n.get('cidr','')} |")
+                yield f"| {r} | VLAN {n.get('vlan','')} | {n.get('cidr','')} |"
 
     if storage_pools:
-        lines.append("== Storage Pools ==")
+        yield "== Storage Pools =="
         for sp in storage_pools:
-            lines.append(f"| {sp['name']} | {sp['type']} | {sp.get('size_gb','')} GB |")
+            yield f"| {sp['name']} | {sp['type']} | {sp.get('size_gb','')} GB |"
 
     if security_devices:
-        lines.append("== Security Devices ==")
+        yield "== Security Devices =="
         for sd in security_devices:
-            lines.append(f"| {sd['name']} | {sd['type']} | {sd.get('role','')} |")
+            yield f"| {sd['name']} | {sd['type']} | {sd.get('role','')} |"
 
     if applications:
-        lines.append("== Application Domains ==")
+        yield "== Application Domains =="
         for domain, color in domain_colors.items():
-            lines.append(f"|<back:{color}> {domain} </back>| app domain |")
+            yield f"|<back:{color}> {domain} </back>| app domain |"
 
     if databases:
-        lines.append("== Databases ==")
+        yield "== Databases =="
         for db in databases:
-            lines.append(f"| {db['name']} | {db['engine']} {db.get('version','')} |")
+            yield f"| {db['name']} | {db['engine']} {db.get('version','')} |"
 
-    lines.append("endlegend")
-    lines.append("")
+    yield "endlegend"
+    yield ""
 
     # -------- NETWORK LAYER --------
-    lines.append("package \"Network Layer\" {")
+    yield "package \"Network Layer\" {"
     net_alias = {}
     for n in nets:
         alias = safe_alias("net_" + n["name"])
@@ -113,29 +164,31 @@ def generate_topology_puml(site: dict) -> str:
             label_parts.append(n["role"])
         # Use single line with separators for cloud labels (multiline not well supported)
         label = " - ".join(label_parts)
-        lines.append(f'  cloud "{q(label)}" as {alias}')
+        yield f'  cloud "{q(label)}" as {alias}'
     # represent 'internet' if any security devices reference it
-    if any("internet" in (sd.get("front_network", ""), *sd.get("inline_between", [])) for sd in security_devices):
-        lines.append('  cloud "Internet" as net_internet')
+    needs_internet = any(
+        sd.get("front_network") == "internet"
+        or sd.get("back_network") == "internet"
+        or "internet" in sd.get("inline_between", ())
+        for sd in security_devices
+    )
+    if needs_internet:
+        yield '  cloud "Internet" as net_internet'
         net_alias["internet"] = "net_internet"
-    lines.append("}")
-    lines.append("")
+    yield "}"
+    yield ""
 
     # -------- SECURITY LAYER --------
     if security_devices:
-        lines.append("package \"Security Layer\" {")
+        yield "package \"Security Layer\" {"
         sec_alias = {}
         for sd in security_devices:
             alias = safe_alias("sec_" + sd["name"])
             sec_alias[sd["name"]] = alias
-            label = "\\n".join([
-                sd["name"],
-                f"type: {sd['type']}",
-                f"role: {sd.get('role','')}"
-            ])
-            lines.append(f'  rectangle "{q(label)}" as {alias} #FFEECC')
-        lines.append("}")
-        lines.append("")
+            label = f"{sd['name']}\\ntype: {sd['type']}\\nrole: {sd.get('role','')}"
+            yield f'  rectangle "{q(label)}" as {alias} #FFEECC'
+        yield "}"
+        yield ""
     else:
         sec_alias = {}
 
@@ -143,7 +196,7 @@ def generate_topology_puml(site: dict) -> str:
     hv_alias = {}
     vm_alias = {}
 
-    lines.append("package \"Compute Layer\" {")
+    yield "package \"Compute Layer\" {"
     for hv in hv_list:
         name = hv["name"]
         alias = safe_alias("hv_" + name)
@@ -153,58 +206,57 @@ def generate_topology_puml(site: dict) -> str:
         hv_cpu = float(hv.get("cpu", 0))
         hv_ram = float(hv.get("ram_gb", 0))
         hv_storage = float(hv.get("storage_gb", 0))
-        vm_cpu_total = sum(float(v.get("cpu", 0)) for v in hv.get("vms", []))
-        vm_ram_total = sum(float(v.get("ram_gb", 0)) for v in hv.get("vms", []))
-        vm_storage_total = sum(float(v.get("storage_gb", 0)) for v in hv.get("vms", []))
+        # One pass over the VMs; totals start at int 0 like sum(), so an empty hypervisor shows "VMs: 0"
+        vm_cpu_total = vm_ram_total = vm_storage_total = 0
+        for v in hv.get("vms", []):
+            vm_cpu_total += float(v.get("cpu", 0))
+            vm_ram_total += float(v.get("ram_gb", 0))
+            vm_storage_total += float(v.get("storage_gb", 0))
 
         _, cpu_oc = overcommit(vm_cpu_total, hv_cpu)
         _, ram_oc = overcommit(vm_ram_total, hv_ram)
         _, st_oc = overcommit(vm_storage_total, hv_storage)
 
-        hv_header = "\\n".join([
-            name,
-            f"CPU: {hv_cpu} (VMs: {vm_cpu_total}, {cpu_oc})",
-            f"RAM: {hv_ram} GB (VMs: {vm_ram_total} GB, {ram_oc})",
-            f"Storage: {hv_storage} GB (VMs: {vm_storage_total} GB, {st_oc})",
-        ])
+        hv_header = (
+            f"{name}"
+            f"\\nCPU: {hv_cpu} (VMs: {vm_cpu_total}, {cpu_oc})"
+            f"\\nRAM: {hv_ram} GB (VMs: {vm_ram_total} GB, {ram_oc})"
+            f"\\nStorage: {hv_storage} GB (VMs: {vm_storage_total} GB, {st_oc})"
+        )
 
         color_suffix = f" {color}" if color else ""
-        lines.append(f'  package "{q(hv_header)}" as {alias}{color_suffix} {{')
+        yield f'  package "{q(hv_header)}" as {alias}{color_suffix} {{'
 
         for vm in hv.get("vms", []):
             vname = vm["name"]
             valias = safe_alias("vm_" + vname)
             vm_alias[vname] = valias
-            label = "\\n".join([
-                vname,
-                f"OS: {vm.get('os','')}",
-                f"CPU: {vm.get('cpu','')}",
-                f"RAM: {vm.get('ram_gb','')} GB",
-                f"Disk: {vm.get('storage_gb','')} GB",
-            ])
-            lines.append(f'    node "{q(label)}" as {valias}')
-        lines.append("  }")
-    lines.append("}")
-    lines.append("")
+            label = (
+                f"{vname}"
+                f"\\nOS: {vm.get('os','')}"
+                f"\\nCPU: {vm.get('cpu','')}"
+                f"\\nRAM: {vm.get('ram_gb','')} GB"
+                f"\\nDisk: {vm.get('storage_gb','')} GB"
+            )
+            yield f'    node "{q(label)}" as {valias}'
+        yield "  }"
+    yield "}"
+    yield ""
 
     # -------- STORAGE LAYER --------
     sp_alias = {}
-    lines.append("package \"Storage Layer\" {")
+    yield "package \"Storage Layer\" {"
     for sp in storage_pools:
         alias = safe_alias("sp_" + sp["name"])
         sp_alias[sp["name"]] = alias
-        label = "\\n".join([
-            sp["name"],
-            f"type: {sp['type']}",
-            f"size: {sp.get('size_gb','')} GB"
-        ])
-        lines.append(f'  database "{q(label)}" as {alias}')
-    lines.append("}")
-    lines.append("")
+        label = f"{sp['name']}\\ntype: {sp['type']}\\nsize: {sp.get('size_gb','')} GB"
+        yield f'  database "{q(label)}" as {alias}'
+    yield "}"
+    yield ""
 
     # -------- APPLICATION LAYER --------
     app_alias = {}
-    lines.append("package \"Application Layer\" {")
+    yield "package \"Application Layer\" {"
     for app in applications:
         name = app["name"]
         alias = safe_alias("app_" + name)
@@ -231,50 +283,50 @@ def generate_topology_puml(site: dict) -> str:
             label_lines.append("tech: " + stack)
 
         label = "\\n".join(label_lines)
-        lines.append(f'  component "{q(label)}" as {alias} {color}')
-    lines.append("}")
-    lines.append("")
+        yield f'  component "{q(label)}" as {alias} {color}'
+    yield "}"
+    yield ""
 
     # -------- Relationships --------
 
-    # VM -> Networks
+    # VM -> Networks, then VM -> Storage. One pass over the VMs emits the network
+    # edges and holds back the storage edges so they still follow all of them.
+    net_alias_get = net_alias.get  # one lookup per NIC, so bind it once
+    storage_edges = []
     for hv in hv_list:
         for vm in hv.get("vms", []):
             valias = vm_alias[vm["name"]]
             for nic in vm.get("networks", []):
                 nname = nic["name"]
-                nalias = net_alias.get(nname)
+                nalias = net_alias_get(nname)
                 if nalias:
                     ip = nic.get("ip", "")
                     line = f"{valias} --> {nalias}"
                     if ip:
                         line += f' : "{ip}"'
-                    lines.append(line)
-
-    # VM -> Storage
-    for hv in hv_list:
-        for vm in hv.get("vms", []):
+                    yield line
             sp = vm.get("storage_pool")
             if sp and sp in sp_alias:
-                lines.append(f"{vm_alias[vm['name']]} ..> {sp_alias[sp]} : storage")
+                storage_edges.append(f"{valias} ..> {sp_alias[sp]} : storage")
+    yield from storage_edges
 
     # Hypervisor -> Storage pool
     for sp in storage_pools:
         for hv in sp.get("hypervisors", []):
             if hv in hv_alias:
-                lines.append(f"{hv_alias[hv]} ..> {sp_alias[sp['name']]} : uses")
+                yield f"{hv_alias[hv]} ..> {sp_alias[sp['name']]} : uses"
 
     # Application -> VM
     for app in applications:
         hosted_on = app.get("hosted_on")
         if hosted_on and hosted_on in vm_alias:
-            lines.append(f"{app_alias[app['name']]} --> {vm_alias[hosted_on]} : hosted on")
+            yield f"{app_alias[app['name']]} --> {vm_alias[hosted_on]} : hosted on"
 
     # Application -> Application
     for app in applications:
         for dep in app.get("depends_on", []):
             if dep in app_alias:
-                lines.append(f"{app_alias[app['name']]} ..> {app_alias[dep]} : depends on")
+                yield f"{app_alias[app['name']]} ..> {app_alias[dep]} : depends on"
 
     # Security devices: connect to networks
     for sd in security_devices:
@@ -283,49 +335,42 @@ def generate_topology_puml(site: dict) -> str:
         back = sd.get("back_network")
         inline = sd.get("inline_between", [])
         if front and front in net_alias:
-            lines.append(f"{net_alias[front]} --> {salias}")
+            yield f"{net_alias[front]} --> {salias}"
         if back and back in net_alias:
-            lines.append(f"{salias} --> {net_alias[back]}")
+            yield f"{salias} --> {net_alias[back]}"
         if inline and len(inline) == 2:
             left, right = inline
             if left in net_alias and right in net_alias:
                 # Split chained relationship into two separate lines (PlantUML doesn't support chained syntax)
-                lines.append(f"{net_alias[left]} --> {salias}")
-                lines.append(f"{salias} --> {net_alias[right]}")
+                yield f"{net_alias[left]} --> {salias}"
+                yield f"{salias} --> {net_alias[right]}"
 
-    lines.append("@enduml")
-    return "\n".join(lines)
+    yield "@enduml"
 
 
 # ============ Microservice / Application Dependency Diagram ============
 
-def generate_microservices_puml(site: dict) -> str:
+def iter_microservices_puml(site: dict, domain_colors: dict | None = None):
     apps = site.get("applications", [])
     if not apps:
-        return "@startuml\n' No applications defined\n@enduml\n"
+        yield from ("@startuml", "' No applications defined", "@enduml", "")
+        return
 
     # domain colors as before
-    domain_colors = {}
-    default_app_colors = ["#CCE5FF", "#FFDDBB", "#E0E0E0", "#D4EDDA", "#F7D7E0"]
-    dc_index = 0
-    for app in apps:
-        domain = app.get("domain", "general")
-        if domain not in domain_colors:
-            domain_colors[domain] = default_app_colors[dc_index % len(default_app_colors)]
-            dc_index += 1
+    if domain_colors is None:
+        domain_colors = build_domain_colors(apps)
 
-    lines = []
-    lines.append("@startuml")
-    lines.append(f"title Microservice / Application Dependencies – {site['name']}")
-    lines.append("skinparam componentStyle rectangle")
-    lines.append("skinparam shadowing false")
+    yield "@startuml"
+    yield f"title Microservice / Application Dependencies – {site['name']}"
+    yield "skinparam componentStyle rectangle"
+    yield "skinparam shadowing false"
 
-    lines.append("legend left")
-    lines.append("== Domains ==")
+    yield "legend left"
+    yield "== Domains =="
     for d, c in domain_colors.items():
-        lines.append(f"|<back:{c}> {d} </back>| domain |")
-    lines.append("endlegend")
-    lines.append("")
+        yield f"|<back:{c}> {d} </back>| domain |"
+    yield "endlegend"
+    yield ""
 
     app_alias = {}
     # Group by domain
@@ -335,7 +380,7 @@ def generate_microservices_puml(site: dict) -> str:
 
     for domain, app_list in domains.items():
         color = domain_colors[domain]
-        lines.append(f'package "{q(domain)}" {color} {{')
+        yield f'package "{q(domain)}" {color} {{'
         for app in app_list:
             name = app["name"]
             alias = safe_alias("app_" + name)
@@ -343,32 +388,31 @@ def generate_microservices_puml(site: dict) -> str:
             tier = app.get("tier", "")
             role = app.get("role", "")
             label = "\\n".join(filter(None, [name, f"tier: {tier}", f"role: {role}"]))
-            lines.append(f'  component "{q(label)}" as {alias}')
-        lines.append("}")
-        lines.append("")
+            yield f'  component "{q(label)}" as {alias}'
+        yield "}"
+        yield ""
 
     # Dependencies
     for app in apps:
         for dep in app.get("depends_on", []):
             if dep in app_alias:
-                lines.append(f"{app_alias[app['name']]} --> {app_alias[dep]}")
+                yield f"{app_alias[app['name']]} --> {app_alias[dep]}"
 
-    lines.append("@enduml")
-    return "\n".join(lines)
+    yield "@enduml"
 
 
 # ============ Database Schema Diagram (simplified ER) ============
 
-def generate_databases_puml(site: dict) -> str:
+def iter_databases_puml(site: dict):
     dbs = site.get("databases", [])
     if not dbs:
-        return "@startuml\n' No databases defined\n@enduml\n"
+        yield from ("@startuml", "' No databases defined", "@enduml", "")
+        return
 
-    lines = []
-    lines.append("@startuml")
-    lines.append(f"title Database Schemas – {site['name']}")
-    lines.append("skinparam classAttributeIconSize 0")
-    lines.append("skinparam shadowing false")
+    yield "@startuml"
+    yield f"title Database Schemas – {site['name']}"
+    yield "skinparam classAttributeIconSize 0"
+    yield "skinparam shadowing false"
 
     db_alias = {}
     table_alias = {}
@@ -378,22 +422,22 @@ def generate_databases_puml(site: dict) -> str:
         dalias = safe_alias("db_" + dname)
         db_alias[dname] = dalias
         label = f"{dname}\\n{db['engine']} {db.get('version','')}"
-        lines.append(f'package "{q(label)}" as {dalias} {{')
+        yield f'package "{q(label)}" as {dalias} {{'
         for table in db.get("schema", {}).get("tables", []):
             tname = table["name"]
             talias = safe_alias(f"{dname}_{tname}")
             table_alias[(dname, tname)] = talias
-            lines.append(f"  class {talias} {{")
+            yield f"  class {talias} {{"
             for col in table.get("columns", []):
                 marker = ""
                 if col.get("pk"):
                     marker = " <<PK>>"
                 elif col.get("fk"):
                     marker = " <<FK>>"
-                lines.append(f"    {col['name']} : {col['type']}{marker}")
-            lines.append("  }")
-        lines.append("}")
-        lines.append("")
+                yield f"    {col['name']} : {col['type']}{marker}"
+            yield "  }"
+        yield "}"
+        yield ""
 
     # basic FK relationships if present
     for db in dbs:
@@ -415,19 +459,17 @@ def generate_databases_puml(site: dict) -> str:
                         continue
                     ref_alias = table_alias.get((ref_db, ref_table))
                     if ref_alias:
-                        lines.append(f"{talias} --> {ref_alias} : {col['name']}")
+                        yield f"{talias} --> {ref_alias} : {col['name']}"
 
-    lines.append("@enduml")
-    return "\n".join(lines)
+    yield "@enduml"
 
 
 # ============ Flow / Sequence Diagrams ============
 
-def generate_flow_puml(site: dict, flow: dict) -> str:
-    lines = []
-    lines.append("@startuml")
-    lines.append(f'title Flow – {q(flow.get("name",""))} ({site["name"]})')
-    lines.append("skinparam shadowing false")
+def iter_flow_puml(site: dict, flow: dict):
+    yield "@startuml"
+    yield f'title Flow – {q(flow.get("name",""))} ({site["name"]})'
+    yield "skinparam shadowing false"
 
     participants = flow.get("participants", [])
     # apps may appear as participants by name
@@ -436,11 +478,11 @@ def generate_flow_puml(site: dict, flow: dict) -> str:
     for p in participants:
         if p in app_names:
             # mark it as component-like participant
-            lines.append(f'participant {safe_alias("app_" + p)} as "{q(p)}"')
+            yield f'participant {safe_alias("app_" + p)} as "{q(p)}"'
         else:
-            lines.append(f'actor {safe_alias("actor_" + p)} as "{q(p)}"')
+            yield f'actor {safe_alias("actor_" + p)} as "{q(p)}"'
 
-    lines.append("")
+    yield ""
     for step in flow.get("steps", []):
         src = step["from"]
         dst = step["to"]
@@ -453,10 +495,71 @@ def generate_flow_puml(site: dict, flow: dict) -> str:
             dst_alias = safe_alias("app_" + dst)
         else:
             dst_alias = safe_alias("actor_" + dst)
-        lines.append(f"{src_alias} -> {dst_alias} : {q(msg)}")
+        yield f"{src_alias} -> {dst_alias} : {q(msg)}"
+
+    yield "@enduml"
+
+
+# ============ Whole-diagram strings ============
+# main streams the iter_*_puml lines straight to disk instead
+
+def generate_topology_puml(site: dict, domain_colors: dict | None = None) -> str:
+    return "\n".join(iter_topology_puml(site, domain_colors))
+
 
-    lines.append("@enduml")
-    return "\n".join(lines)
+def generate_microservices_puml(site: dict, domain_colors: dict | None = None) -> str:
+    return "\n".join(iter_microservices_puml(site, domain_colors))
+
+
+def generate_databases_puml(site: dict) -> str:
+    return "\n".join(iter_databases_puml(site))
+
+
+def generate_flow_puml(site: dict, flow: dict) -> str:
+    return "\n".join(iter_flow_puml(site, flow))
+
+
+# ============ Input loading ============
+# The parsed YAML is pickled per user, one file per input path, and stamped with
+# the file's size and mtime, so re-rendering an unchanged inventory skips YAML
+# parsing entirely. An edited inventory replaces its earlier entry.
+
+def yaml_cache_path(input_yaml: Path):
+    if os.environ.get(CACHE_ENV_VAR) == "0":
+        return None
+    key = str(input_yaml.resolve()).encode("utf-8", "surrogateescape")
+    digest = hashlib.blake2b(key, digest_size=16).hexdigest()
+    # Per-user directory: unpickling a file someone else could plant in /tmp is unsafe
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "csv_to_yaml" / f"infra_{digest}.pkl"
+
+
+def load_infra(input_yaml: Path):
+    cache_path = yaml_cache_path(input_yaml)
+    if cache_path is not None:
+        stat = input_yaml.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        try:
+            with cache_path.open("rb") as f:
+                cached_stamp, data = pickle.load(f)
+            if cached_stamp == stamp:
+                return data
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError, TypeError):
+            pass
+
+    data = yaml.load(input_yaml.read_text(), Loader=SafeLoader)
+
+    if cache_path is not None:
+        # A failed write only costs the next run a parse
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            with tmp_path.open("wb") as f:
+                pickle.dump((stamp, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+    return data
 
 
 # ============ Main driver ============
@@ -470,38 +573,37 @@ def main():
     out_dir = Path(sys.argv[2])
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    data = yaml.safe_load(input_yaml.read_text())
+    data = load_infra(input_yaml)
+    puml_files = []
 
     for site in data.get("sites", []):
         site_name = site["name"]
         print(f"[INFO] Processing site: {site_name}")
+        domain_colors = build_domain_colors(site.get("applications", []))
 
         # Topology
-        topology_puml = generate_topology_puml(site)
         topology_file = out_dir / f"{site_name}_topology.puml"
-        topology_file.write_text(topology_puml, encoding="utf-8")
-        render_file(topology_file)
+        write_puml(topology_file, iter_topology_puml(site, domain_colors))
+        puml_files.append(topology_file)
 
         # Microservices
-        micro_puml = generate_microservices_puml(site)
         micro_file = out_dir / f"{site_name}_microservices.puml"
-        micro_file.write_text(micro_puml, encoding="utf-8")
-        render_file(micro_file)
+        write_puml(micro_file, iter_microservices_puml(site, domain_colors))
+        puml_files.append(micro_file)
 
         # Databases
-        db_puml = generate_databases_puml(site)
         db_file = out_dir / f"{site_name}_databases.puml"
-        db_file.write_text(db_puml, encoding="utf-8")
-        render_file(db_file)
+        write_puml(db_file, iter_databases_puml(site))
+        puml_files.append(db_file)
 
         # Flows
         for flow in site.get("flows", []):
             fname = flow.get("name", "flow")
-            flow_puml = generate_flow_puml(site, flow)
             flow_file = out_dir / f"{site_name}_flow_{safe_alias(fname)}.puml"
-            flow_file.write_text(flow_puml, encoding="utf-8")
-            render_file(flow_file)
+            write_puml(flow_file, iter_flow_puml(site, flow))
+            puml_files.append(flow_file)
 
+    render_files(puml_files)
     print("[INFO] All diagrams generated.")
 
 
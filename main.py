@@ -5,11 +5,45 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import os
+import re
+import sys
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 import yaml
 
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:  # libyaml bindings not available
+    from yaml import SafeDumper
+
+# Rows emitted per YAML dump call when streaming a CSV file.
+STREAM_CHUNK_ROWS = 1024
+
+# Buffer size for CSV reads and YAML writes.
+IO_BUFFER_SIZE = 1 << 20
+
+# libyaml's default line width; plain and single-quoted scalars fold at spaces past it.
+YAML_LINE_WIDTH = 80
+
+# libyaml writes longer mapping keys as explicit "? key" entries.
+YAML_SIMPLE_KEY_LIMIT = 128
+
+# ASCII strings libyaml never needs escapes or indicators for in block context.
+_PLAIN_SCALAR_RE = re.compile(r"[A-Za-z0-9_][A-Za-z0-9_./@+(),-]*(?: [A-Za-z0-9_./@+(),-]+)*")
+
+_yaml_resolver = yaml.resolver.Resolver()
+
+# Numeric cells that --infer-types writes as numbers: only spellings every YAML
+# loader reads the same way (no leading zeros, exponents or underscores).
+_INT_CELL_RE = re.compile(r"0|-?[1-9][0-9]{0,17}")
+_FLOAT_CELL_RE = re.compile(r"-?(?:0|[1-9][0-9]*)\.[0-9]+")
+
+_JSON_TYPES = {str: "string", int: "integer", float: "number"}
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -30,33 +64,263 @@ def parse_args() -> argparse.Namespace:
         type=Path,
         help="Optional output path for the JSON Schema (defaults next to YAML).",
     )
+    parser.add_argument(
+        "--infer-types",
+        action="store_true",
+        help="Write integer and decimal cells as YAML numbers and type the schema columns to match.",
+    )
     return parser.parse_args()
 
 
+def _fadvise(file, advice_name: str) -> None:
+    """Pass an access-pattern hint to the kernel where posix_fadvise exists."""
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(file.fileno(), 0, 0, advice)
+    except OSError:
+        pass
+
+
+def _row_record(row: List[str], fieldnames: List[str]) -> Dict[Optional[str], object]:
+    """Build the dictionary csv.DictReader would return for a row."""
+    width = len(fieldnames)
+    record: Dict[Optional[str], object] = dict(zip(fieldnames, row))
+    if len(row) > width:
+        record[None] = row[width:]
+    elif len(row) < width:
+        for key in fieldnames[len(row):]:
+            record[key] = None
+    return record
+
+
+def _iter_rows(reader: Iterator[List[str]], fieldnames: List[str]) -> Iterator[Dict[Optional[str], object]]:
+    """Yield row dictionaries from a csv.reader with csv.DictReader semantics."""
+    for row in reader:
+        if row:
+            yield _row_record(row, fieldnames)
+
+
+@lru_cache(maxsize=4096)
+def _yaml_scalar(value: str) -> Optional[str]:
+    """Return how SafeDumper spells a string, or None if it needs the emitter.
+
+    Strings of plain characters are written bare unless they would load back as
+    another type (numbers, booleans, dates), in which case they are single
+    quoted. CSV columns repeat values heavily, so the result is cached.
+    """
+    if not value:
+        return "''"
+    if not _PLAIN_SCALAR_RE.fullmatch(value):
+        return None
+    if _yaml_resolver.resolve(yaml.ScalarNode, value, (True, False)) == yaml.resolver.BaseResolver.DEFAULT_SCALAR_TAG:
+        return value
+    return f"'{value}'"
+
+
+@lru_cache(maxsize=4096)
+def _coerce_cell(value: str) -> object:
+    """Return the int or float a numeric CSV cell stands for, or the cell unchanged."""
+    if _INT_CELL_RE.fullmatch(value):
+        return int(value)
+    if _FLOAT_CELL_RE.fullmatch(value):
+        return float(value)
+    return value
+
+
+def _typed_scalar(cell: object) -> Optional[str]:
+    """Return how SafeDumper spells a coerced cell, or None if it needs the emitter."""
+    if type(cell) is str:
+        return _yaml_scalar(cell)
+    if type(cell) is int:
+        return str(cell)
+    # SafeDumper writes floats as their repr unless that uses an exponent
+    spelling = repr(cell)
+    return None if "e" in spelling else spelling
+
+
+def _typed_rows(
+    reader: Iterator[List[str]], fieldnames: List[str], column_types: Dict[str, Set[str]]
+) -> Iterator[List[object]]:
+    """Coerce numeric cells of each row, adding the JSON Schema type of every cell to column_types."""
+    type_sets = [column_types.setdefault(name, set()) for name in fieldnames]
+    for row in reader:
+        cells = [_coerce_cell(value) for value in row]
+        if cells:
+            for types, cell in zip(type_sets, cells):
+                types.add(_JSON_TYPES[type(cell)])
+            for types in type_sets[len(cells):]:
+                types.add("null")
+        yield cells
+
+
+def _row_prefixes(fieldnames: List[str]) -> Optional[List[str]]:
+    """Return the text written before each value of a row, or None if the header needs the emitter."""
+    if len(set(fieldnames)) != len(fieldnames):
+        # Repeated columns collapse into one key per row
+        return None
+    prefixes = []
+    for name in fieldnames:
+        key = _yaml_scalar(name)
+        if key is None or len(key) > YAML_SIMPLE_KEY_LIMIT:
+            return None
+        prefixes.append(f"  {key}: ")
+    if prefixes:
+        prefixes[0] = "- " + prefixes[0][2:]
+    return prefixes
+
+
+def _write_yaml_rows(
+    yaml_file,
+    reader: Iterator[List[object]],
+    fieldnames: List[str],
+    spell: Callable[[object], Optional[str]] = _yaml_scalar,
+) -> int:
+    """Write CSV rows to a YAML file as one block sequence and return the row count.
+
+    Rows whose keys and values all have a fixed spelling are formatted
+    directly; the rest go through the libyaml emitter in chunks of
+    STREAM_CHUNK_ROWS. Both produce exactly the text yaml.dump would write
+    for the whole list. spell returns a cell's spelling, or None for cells
+    that need the emitter.
+    """
+    prefixes = _row_prefixes(fieldnames)
+    if prefixes is None:
+        row_count = 0
+        rows = _iter_rows(reader, fieldnames)
+        while chunk := list(islice(rows, STREAM_CHUNK_ROWS)):
+            yaml.dump(chunk, yaml_file, Dumper=SafeDumper, sort_keys=False)
+            row_count += len(chunk)
+        return row_count
+
+    width = len(fieldnames)
+    row_count = 0
+    pending: List[Dict[Optional[str], object]] = []
+    write = yaml_file.write
+    for row in reader:
+        if not row:
+            continue
+        row_count += 1
+        if len(row) == width:
+            lines = []
+            for prefix, value in zip(prefixes, row):
+                scalar = spell(value)
+                if scalar is None or (" " in scalar and len(prefix) + len(scalar) > YAML_LINE_WIDTH):
+                    break
+                lines.append(f"{prefix}{scalar}\n")
+            else:
+                if pending:
+                    yaml.dump(pending, yaml_file, Dumper=SafeDumper, sort_keys=False)
+                    pending = []
+                write("".join(lines))
+                continue
+        pending.append(_row_record(row, fieldnames))
+        if len(pending) >= STREAM_CHUNK_ROWS:
+            yaml.dump(pending, yaml_file, Dumper=SafeDumper, sort_keys=False)
+            pending = []
+    if pending:
+        yaml.dump(pending, yaml_file, Dumper=SafeDumper, sort_keys=False)
+    return row_count
+
+
 def convert_csv_to_yaml(csv_path: Path, yaml_path: Path) -> Tuple[List[Dict[str, str]], Sequence[str]]:
     if not csv_path.is_file():
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
 
-    with csv_path.open(newline="", encoding="utf-8") as csv_file:
-        reader = csv.DictReader(csv_file)
-        if reader.fieldnames is None:
+    with csv_path.open(newline="", encoding="utf-8", buffering=IO_BUFFER_SIZE) as csv_file:
+        _fadvise(csv_file, "POSIX_FADV_SEQUENTIAL")
+        reader = csv.reader(csv_file)
+        fieldnames = next(reader, None)
+        if fieldnames is None:
             raise ValueError("CSV file is missing a header row.")
-        rows: List[Dict[str, str]] = list(reader)
+        # Interned keys are shared by every row dict and by schemas across files.
+        fieldnames = [sys.intern(name) for name in fieldnames]
+        rows: List[Dict[str, str]] = list(_iter_rows(reader, fieldnames))
 
     yaml_path.parent.mkdir(parents=True, exist_ok=True)
-    with yaml_path.open("w", encoding="utf-8") as yaml_file:
-        yaml.safe_dump(rows, yaml_file, sort_keys=False)
+    with yaml_path.open("w", encoding="utf-8", buffering=IO_BUFFER_SIZE) as yaml_file:
+        yaml.dump(rows, yaml_file, Dumper=SafeDumper, sort_keys=False)
 
-    return rows, reader.fieldnames
+    return rows, fieldnames
+
+
+def stream_csv_to_yaml(
+    csv_path: Path, yaml_path: Path, column_types: Optional[Dict[str, Set[str]]] = None
+) -> Tuple[int, List[str]]:
+    """Convert a CSV file to YAML without holding every row in memory.
+
+    Rows are formatted by _write_yaml_rows as they are read; each row is a
+    block sequence entry, so they concatenate into the same single YAML list
+    that convert_csv_to_yaml produces.
+
+    If column_types is given, integer and decimal cells are written as YAML
+    numbers instead of strings, and the JSON Schema types found in each
+    column ("string", "integer", "number", or "null" for missing cells) are
+    added to it under the column name.
+
+    Returns:
+        Tuple of (row_count, fieldnames)
+    """
+    if not csv_path.is_file():
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+
+    with csv_path.open(newline="", encoding="utf-8", buffering=IO_BUFFER_SIZE) as csv_file:
+        _fadvise(csv_file, "POSIX_FADV_SEQUENTIAL")
+        reader = csv.reader(csv_file)
+        fieldnames = next(reader, None)
+        if fieldnames is None:
+            raise ValueError("CSV file is missing a header row.")
+        # Interned keys are shared by every row dict and by schemas across files.
+        fieldnames = [sys.intern(name) for name in fieldnames]
+        yaml_path.parent.mkdir(parents=True, exist_ok=True)
+        with yaml_path.open("w", encoding="utf-8", buffering=IO_BUFFER_SIZE) as yaml_file:
+            if column_types is None:
+                row_count = _write_yaml_rows(yaml_file, reader, fieldnames)
+            else:
+                rows = _typed_rows(reader, fieldnames, column_types)
+                row_count = _write_yaml_rows(yaml_file, rows, fieldnames, _typed_scalar)
+            if not row_count:
+                yaml.dump([], yaml_file, Dumper=SafeDumper)
+            # Batches write many files once each; don't let them crowd the page cache
+            yaml_file.flush()
+            _fadvise(yaml_file, "POSIX_FADV_DONTNEED")
+
+    return row_count, fieldnames
+
+
+def read_csv_header(csv_path: Path) -> List[str]:
+    """Return the header row of a CSV file without reading the rest of it."""
+    if not csv_path.is_file():
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+
+    with csv_path.open(newline="", encoding="utf-8") as csv_file:
+        fieldnames = next(csv.reader(csv_file), None)
+    if fieldnames is None:
+        raise ValueError("CSV file is missing a header row.")
+    return fieldnames
 
 
 def derive_schema_path(yaml_path: Path) -> Path:
     return yaml_path.with_name(f"{yaml_path.stem}.schema.json")
 
 
-def build_schema(fieldnames: Iterable[str]) -> Dict[str, object]:
+def _schema_type(types: Set[str]) -> object:
+    """Collapse the types seen in a column into a JSON Schema "type" value."""
+    if "number" in types:
+        types = types - {"integer"}
+    if not types:
+        return "string"
+    if len(types) == 1:
+        return next(iter(types))
+    return sorted(types)
+
+
+def build_schema(
+    fieldnames: Iterable[str], column_types: Optional[Dict[str, Set[str]]] = None
+) -> Dict[str, object]:
     properties = {
-        name: {"type": "string"}
+        name: {"type": "string" if column_types is None else _schema_type(column_types.get(name, set()))}
         for name in fieldnames
     }
     return {
@@ -74,14 +338,16 @@ def build_schema(fieldnames: Iterable[str]) -> Dict[str, object]:
 
 def write_schema(schema: Dict[str, object], schema_path: Path) -> None:
     schema_path.parent.mkdir(parents=True, exist_ok=True)
-    schema_path.write_text(json.dumps(schema, indent=2), encoding="utf-8")
+    # ensure_ascii output is pure ASCII, so it is written as bytes in one call
+    schema_path.write_bytes(json.dumps(schema, indent=2).encode("ascii"))
 
 
 def main() -> None:
     args = parse_args()
-    _, fieldnames = convert_csv_to_yaml(args.csv_file, args.yaml_file)
+    column_types: Optional[Dict[str, Set[str]]] = {} if args.infer_types else None
+    _, fieldnames = stream_csv_to_yaml(args.csv_file, args.yaml_file, column_types)
     schema_path = args.schema or derive_schema_path(args.yaml_file)
-    schema = build_schema(fieldnames)
+    schema = build_schema(fieldnames, column_types)
     write_schema(schema, schema_path)
 
 
@@ -3,11 +3,60 @@
 from __future__ import annotations
 
 import argparse
+import re
 import sys
 from pathlib import Path
 
-from ruamel.yaml import YAML
-from ruamel.yaml.comments import CommentedMap, CommentedSeq
+import yaml
+from yaml.events import (
+    AliasEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+)
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml bindings not available
+    from yaml import SafeLoader
+
+# YAML 1.2 implicit resolvers for plain scalars, tried in this order
+_BOOL_RE = re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$")
+_FLOAT_RE = re.compile(
+    r"""^(?:
+     [-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+]?[0-9]+)?
+    |[-+]?(?:[0-9][0-9_]*)(?:[eE][-+]?[0-9]+)
+    |[-+]?\.[0-9_]+(?:[eE][-+][0-9]+)?
+    |[-+]?\.(?:inf|Inf|INF)
+    |\.(?:nan|NaN|NAN))$""",
+    re.X,
+)
+_INT_RE = re.compile(
+    r"""^(?:[-+]?0b[0-1_]+
+    |[-+]?0o?[0-7_]+
+    |[-+]?[0-9_]+
+    |[-+]?0x[0-9a-fA-F_]+)$""",
+    re.X,
+)
+# Merge keys, nulls, timestamps and "=" never construct to a str, int or float
+_UNMATCHABLE_RE = re.compile(
+    r"""^(?:<<|~|null|Null|NULL|=|
+     [0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]
+    |[0-9][0-9][0-9][0-9] -[0-9][0-9]? -[0-9][0-9]?
+    (?:[Tt]|[ \t]+)[0-9][0-9]?
+    :[0-9][0-9] :[0-9][0-9] (?:\.[0-9]*)?
+    (?:[ \t]*(?:Z|[-+][0-9][0-9]?(?::[0-9][0-9])?))?)$""",
+    re.X,
+)
+# First characters that can start a non-string plain scalar
+_TYPED_FIRST_CHARS = frozenset("-+0123456789.tTfFnN~<=")
+
+_STR_TAG = "tag:yaml.org,2002:str"
+_INT_TAG = "tag:yaml.org,2002:int"
+_FLOAT_TAG = "tag:yaml.org,2002:float"
+_BOOL_TAG = "tag:yaml.org,2002:bool"
 
 
 def parse_args() -> argparse.Namespace:
@@ -37,71 +86,221 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def load_yaml_with_positions(path: Path):
-    """Load YAML file with position information preserved."""
+def iter_yaml_events(path: Path):
+    """Parse a YAML file into its event stream, which carries the line of every node."""
     if not path.is_file():
         raise FileNotFoundError(f"YAML file not found: {path}")
-    yaml_loader = YAML()
     with path.open(encoding="utf-8") as fh:
-        return yaml_loader.load(fh)
+        yield from yaml.parse(fh, Loader=SafeLoader)
+
+
+def key_may_occur(text: str, key: str) -> bool:
+    """Cheaply rule out documents that cannot contain a key.
+    
+    A key is spelled out literally in the source unless escapes, quote
+    doubling or line folding produced it, so a key without quotes or
+    whitespace that is not a substring of an escape-free document is absent.
+    
+    Args:
+        text: The raw YAML document
+        key: The key to search for
+    
+    Returns:
+        False only if the key certainly does not occur
+    """
+    if not key or "'" in key or any(ch.isspace() for ch in key) or "\\" in text:
+        return True
+    return key in text
+
+
+def _construct_int(text: str) -> int:
+    value_s = text.replace("_", "")
+    sign = 1
+    if value_s[0] in "+-":
+        if value_s[0] == "-":
+            sign = -1
+        value_s = value_s[1:]
+    if value_s.startswith("0b"):
+        return sign * int(value_s[2:], 2)
+    if value_s.startswith("0x"):
+        return sign * int(value_s[2:], 16)
+    if value_s.startswith("0o"):
+        return sign * int(value_s[2:], 8)
+    return sign * int(value_s)
+
+
+def _construct_float(text: str) -> float:
+    value_s = text.replace("_", "").lower()
+    if value_s.endswith(".inf"):
+        return float("-inf") if value_s[0] == "-" else float("inf")
+    if value_s == ".nan":
+        return float("nan")
+    return float(value_s)
 
 
-def normalize_value(value: any, target_value: str) -> bool:
-    """Compare a value with the target value, handling type conversions."""
-    # Convert both to string for comparison, but also check for exact type matches
+def construct_scalar(event: ScalarEvent) -> str | int | float | None:
+    """Type a scalar event the way a YAML 1.2 round-trip load would.
+    
+    Only str, int and float values can match a search, so nulls, timestamps
+    and custom-tagged scalars are returned as None. Anchored booleans load as
+    the integers 0 and 1, unanchored ones as bool.
+    
+    Args:
+        event: The scalar event to construct
+    
+    Returns:
+        The typed value, or None if it can never match
+    """
+    text = event.value
+    tag = event.tag
+    try:
+        if tag is None:
+            if not event.implicit[0]:
+                # Quoted and block scalars are always strings
+                return text
+            if text and text[0] not in _TYPED_FIRST_CHARS:
+                return text
+            if _BOOL_RE.match(text):
+                flag = text[0] in "tT"
+                return int(flag) if event.anchor else flag
+            if _FLOAT_RE.match(text):
+                return _construct_float(text)
+            if _INT_RE.match(text):
+                return _construct_int(text)
+            if not text or _UNMATCHABLE_RE.match(text):
+                return None
+            return text
+        if tag == "!" or tag == _STR_TAG:
+            return text
+        if tag == _INT_TAG:
+            return _construct_int(text)
+        if tag == _FLOAT_TAG:
+            return _construct_float(text)
+        if tag == _BOOL_TAG:
+            flag = text.lower() == "true"
+            return int(flag) if event.anchor else flag
+    except (ValueError, IndexError):
+        pass
+    return None
+
+
+def typed_targets(target_value: str) -> tuple[int | None, float | None]:
+    """Parse the target value as int and float once, None where it is neither."""
+    try:
+        target_int = int(target_value)
+    except ValueError:
+        target_int = None
+    try:
+        target_float = float(target_value)
+    except ValueError:
+        target_float = None
+    return target_int, target_float
+
+
+def normalize_value(
+    value: any, target_value: str, targets: tuple[int | None, float | None] | None = None
+) -> bool:
+    """Compare a value with the target value, handling type conversions.
+    
+    targets are the typed forms of target_value from typed_targets; pass them
+    when comparing many values against the same target.
+    """
     if isinstance(value, str):
         return value == target_value
-    elif isinstance(value, (int, float, bool)):
+    elif isinstance(value, (int, float)):
         # Try to match as string representation
         if str(value) == target_value:
             return True
-        # Also try to parse target_value as the same type
-        try:
-            if isinstance(value, int):
-                return value == int(target_value)
-            elif isinstance(value, float):
-                return value == float(target_value)
-            elif isinstance(value, bool):
-                # Handle boolean string representations
-                if target_value.lower() in ("true", "1", "yes", "on"):
-                    return value is True
-                elif target_value.lower() in ("false", "0", "no", "off"):
-                    return value is False
-        except (ValueError, TypeError):
-            pass
+        # Also match the target parsed as the same type (bools compare as ints)
+        target_int, target_float = typed_targets(target_value) if targets is None else targets
+        if isinstance(value, int):
+            return target_int is not None and value == target_int
+        return target_float is not None and value == target_float
     return False
 
 
-def get_line_number_for_key_value(
-    parent: CommentedMap, key: str, value: any
-) -> int | None:
-    """Get the line number for a key-value pair in a CommentedMap.
+def build_key_index(events) -> dict[str, list[tuple[int, ScalarEvent]]]:
+    """Index every scalar-valued mapping entry in a YAML event stream by its key.
+    
+    The stream is walked once; each query against the index then only looks
+    at the entries that actually hold the key. Values are kept as events and
+    only typed when a query reaches them.
     
     Args:
-        parent: The parent CommentedMap containing the key-value pair
-        key: The key to find
-        value: The value (used for context, but we match on key position)
+        events: Events from iter_yaml_events
     
     Returns:
-        Line number (1-indexed) or None if not found
+        Dictionary mapping each string key to (line_number, value_event) pairs
     """
-    if not isinstance(parent, CommentedMap) or key not in parent:
-        return None
-    
-    if hasattr(parent, "lc") and parent.lc:
-        try:
-            # Try to get the key line number
-            key_pos = parent.lc.key(key)
-            if key_pos:
-                return key_pos[0] + 1  # ruamel.yaml uses 0-indexed, convert to 1-indexed
-            # Fallback to value line number
-            value_pos = parent.lc.value(key)
-            if value_pos:
-                return value_pos[0] + 1
-        except (AttributeError, IndexError, TypeError):
-            pass
+    index: dict[str, list[tuple[int, ScalarEvent]]] = {}
+    anchors: dict[str, ScalarEvent | None] = {}
+    # One entry per open collection: None for a sequence or a mapping waiting
+    # for its next key, otherwise the (key, line) pair waiting for its value
+    stack: list[tuple[any, int] | None] = []
+    in_mapping: list[bool] = []
     
-    return None
+    for event in events:
+        cls = type(event)
+        if cls is ScalarEvent:
+            node = event
+            if event.anchor:
+                anchors[event.anchor] = event
+        elif cls is AliasEvent:
+            node = anchors.get(event.anchor)
+        elif cls is MappingStartEvent or cls is SequenceStartEvent:
+            node = None
+            if event.anchor:
+                anchors[event.anchor] = None
+        elif cls is MappingEndEvent or cls is SequenceEndEvent:
+            stack.pop()
+            in_mapping.pop()
+            continue
+        else:
+            continue
+        
+        if in_mapping and in_mapping[-1]:
+            pending = stack[-1]
+            if pending is None:
+                key = construct_scalar(node) if node is not None else None
+                # Event marks are 0-indexed
+                stack[-1] = (key, event.start_mark.line + 1)
+            else:
+                key, line = pending
+                if node is not None and type(key) is str:
+                    index.setdefault(key, []).append((line, node))
+                stack[-1] = None
+        
+        if cls is MappingStartEvent or cls is SequenceStartEvent:
+            stack.append(None)
+            in_mapping.append(cls is MappingStartEvent)
+    return index
+
+
+def search_key_index(
+    index: dict[str, list[tuple[int, ScalarEvent]]], key: str, value: str
+) -> tuple[int, list[int]]:
+    """Search a key index built by build_key_index for a specific key-value pair.
+    
+    Args:
+        index: Index of the YAML document
+        key: The key to search for
+        value: The value to match
+    
+    Returns:
+        Tuple of (count, line_numbers), as for search_yaml_for_key_value
+    """
+    targets = typed_targets(value)
+    line_numbers = [
+        line
+        for line, node in index.get(key, ())
+        if normalize_value(construct_scalar(node), value, targets)
+    ]
+    
+    # Sort and deduplicate line numbers
+    line_numbers = sorted(set(line_numbers))
+    count = len(line_numbers)
+    
+    return count, line_numbers
 
 
 def search_yaml_for_key_value(
@@ -119,61 +318,12 @@ def search_yaml_for_key_value(
         - count: Number of instances found
         - line_numbers: List of line numbers (1-indexed) where matches were found
     """
-    yaml_data = load_yaml_with_positions(yaml_file)
-    line_numbers: list[int] = []
-    
-    def search_recursive(data: any, parent: CommentedMap | None = None):
-        """Recursively search through YAML data structure."""
-        if isinstance(data, CommentedMap):
-            # Check if this map has the key-value pair we're looking for
-            if key in data and normalize_value(data[key], value):
-                line_num = get_line_number_for_key_value(data, key, data[key])
-                if line_num is not None:
-                    line_numbers.append(line_num)
-                else:
-                    # Fallback: try to get line number from the map itself
-                    if hasattr(data, "lc") and data.lc:
-                        try:
-                            line_num = data.lc.line + 1
-                            if line_num:
-                                line_numbers.append(line_num)
-                        except (AttributeError, TypeError):
-                            pass
-            
-            # Recursively search all values in this map
-            for k, v in data.items():
-                search_recursive(v, data)
-        
-        elif isinstance(data, (CommentedSeq, list)):
-            # Recursively search all items in this list
-            for item in data:
-                search_recursive(item)
-        
-        elif isinstance(data, dict):
-            # Handle plain dict (not CommentedMap)
-            if key in data and normalize_value(data[key], value):
-                # Try to find line number from parent if available
-                if parent and isinstance(parent, CommentedMap):
-                    line_num = get_line_number_for_key_value(parent, key, data[key])
-                    if line_num is not None:
-                        line_numbers.append(line_num)
-            
-            # Recursively search all values in this dict
-            for v in data.values():
-                search_recursive(v)
-        
-        elif isinstance(data, list):
-            # Handle plain list (not CommentedSeq)
-            for item in data:
-                search_recursive(item)
-    
-    search_recursive(yaml_data)
-    
-    # Sort and deduplicate line numbers
-    line_numbers = sorted(set(line_numbers))
-    count = len(line_numbers)
-    
-    return count, line_numbers
+    if not yaml_file.is_file():
+        raise FileNotFoundError(f"YAML file not found: {yaml_file}")
+    text = yaml_file.read_text(encoding="utf-8")
+    if not key_may_occur(text, key):
+        return 0, []
+    return search_key_index(build_key_index(yaml.parse(text, Loader=SafeLoader)), key, value)
 
 
 def main() -> None:
@@ -0,0 +1,119 @@
+import os
+from pathlib import Path
+
+import yaml
+
+from batch_convert import batch_convert, batch_convert_with, convert_file
+
+
+def write_csvs(folder: Path, count: int) -> None:
+    for i in range(count):
+        (folder / f"records_{i}.csv").write_text(
+            "id,name\n"
+            f"{i},Name {i}\n",
+            encoding="utf-8",
+        )
+
+
+def touch_output(input_file, output_dir, generate_schema, overwrite, dry_run):
+    print(f"custom: {input_file.name}")
+    (output_dir / f"{input_file.stem}.out").write_text("done", encoding="utf-8")
+    return input_file.stem != "records_1"
+
+
+def test_batch_convert_serial(tmp_path):
+    write_csvs(tmp_path, 2)
+
+    success, total = batch_convert(tmp_path, jobs=1)
+
+    assert (success, total) == (2, 2)
+    written = yaml.safe_load((tmp_path / "records_1.yaml").read_text(encoding="utf-8"))
+    assert written == [{"id": "1", "name": "Name 1"}]
+    assert (tmp_path / "records_1.schema.json").is_file()
+
+
+def test_batch_convert_parallel(tmp_path):
+    write_csvs(tmp_path, 4)
+    output_dir = tmp_path / "out"
+
+    success, total = batch_convert(tmp_path, output_dir=output_dir, jobs=2)
+
+    assert (success, total) == (4, 4)
+    assert sorted(p.name for p in output_dir.glob("*.yaml")) == [
+        f"records_{i}.yaml" for i in range(4)
+    ]
+
+
+def test_batch_convert_thread_workers(tmp_path, capsys):
+    write_csvs(tmp_path, 4)
+
+    assert batch_convert(tmp_path, jobs=2, workers_mode="thread") == (4, 4)
+    assert len(list(tmp_path.glob("*.yaml"))) == 4
+    # Parallel runs count finished files instead of numbering inputs
+    progress = [line for line in capsys.readouterr().out.splitlines() if line.startswith("[")]
+    assert [line.split()[0] for line in progress] == ["[1/4", "[2/4", "[3/4", "[4/4"]
+    assert all(" done] records_" in line for line in progress)
+
+
+def test_batch_convert_incremental_rebuilds_stale_outputs(tmp_path):
+    write_csvs(tmp_path, 1)
+    csv_path = tmp_path / "records_0.csv"
+    yaml_path = tmp_path / "records_0.yaml"
+    batch_convert(tmp_path, jobs=1)
+
+    csv_path.write_text("id,name\n0,Renamed\n", encoding="utf-8")
+    stale = yaml_path.stat().st_mtime_ns - 1_000_000_000
+    os.utime(yaml_path, ns=(stale, stale))
+
+    assert batch_convert(tmp_path, jobs=1, incremental=True) == (1, 1)
+    written = yaml.safe_load(yaml_path.read_text(encoding="utf-8"))
+    assert written == [{"id": "0", "name": "Renamed"}]
+
+
+def test_batch_convert_schema_only_skips_yaml(tmp_path):
+    write_csvs(tmp_path, 2)
+
+    assert batch_convert(tmp_path, jobs=1, schema_only=True) == (2, 2)
+    assert not list(tmp_path.glob("*.yaml"))
+    assert len(list(tmp_path.glob("*.schema.json"))) == 2
+
+
+def test_convert_file_returns_messages_without_printing(tmp_path, capsys):
+    write_csvs(tmp_path, 1)
+
+    result = convert_file(tmp_path / "records_0.csv", tmp_path)
+
+    assert result.ok
+    assert result.messages == [
+        "  ✓ Converted: records_0.yaml (1 rows)",
+        "  ✓ Generated schema: records_0.schema.json",
+    ]
+    assert capsys.readouterr() == ("", "")
+
+
+def test_convert_file_result_is_falsy_on_failure(tmp_path):
+    result = convert_file(tmp_path / "missing.csv", tmp_path)
+
+    assert not result
+    assert not result.ok
+    assert result.errors
+
+
+def test_batch_convert_with_custom_function(tmp_path, capsys):
+    write_csvs(tmp_path, 2)
+
+    assert batch_convert_with(touch_output, tmp_path, jobs=1) == (1, 2)
+    assert (tmp_path / "records_0.out").is_file()
+    assert "custom: records_0.csv" in capsys.readouterr().out
+
+
+def test_batch_convert_with_closure_runs_serially(tmp_path):
+    write_csvs(tmp_path, 3)
+    seen = []
+
+    def convert(input_file, output_dir, generate_schema, overwrite, dry_run):
+        seen.append(input_file.name)
+        return True
+
+    assert batch_convert_with(convert, tmp_path, jobs=2) == (3, 3)
+    assert seen == [f"records_{i}.csv" for i in range(3)]
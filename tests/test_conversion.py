@@ -1,8 +1,16 @@
+import json
 from pathlib import Path
 
 import yaml
 
-from main import build_schema, convert_csv_to_yaml, derive_schema_path
+from main import (
+    build_schema,
+    convert_csv_to_yaml,
+    derive_schema_path,
+    read_csv_header,
+    stream_csv_to_yaml,
+    write_schema,
+)
 
 
 def write_csv(tmp_path: Path, name: str) -> Path:
@@ -29,6 +37,46 @@ def test_convert_csv_to_yaml(tmp_path):
     assert written == rows
 
 
+def test_stream_csv_to_yaml_matches_convert(tmp_path):
+    csv_path = write_csv(tmp_path, "records.csv")
+    expected_path = tmp_path / "expected.yaml"
+    streamed_path = tmp_path / "streamed.yaml"
+
+    rows, headers = convert_csv_to_yaml(csv_path, expected_path)
+    row_count, streamed_headers = stream_csv_to_yaml(csv_path, streamed_path)
+
+    assert row_count == len(rows)
+    assert streamed_headers == headers
+    assert streamed_path.read_text(encoding="utf-8") == expected_path.read_text(encoding="utf-8")
+
+
+def test_stream_csv_to_yaml_matches_convert_for_quoted_values(tmp_path):
+    csv_path = tmp_path / "mixed.csv"
+    csv_path.write_text(
+        "id,name,note\n"
+        "1,yes,\n"
+        "2,Smith, John\n"
+        "3,\"a: b\",caf\u00e9\n"
+        "4,\"multi\nline\",2024-01-02,extra\n"
+        "5,-\n"
+        + "6,plain," + "word " * 30 + "end\n",
+        encoding="utf-8",
+    )
+    expected_path = tmp_path / "expected.yaml"
+    streamed_path = tmp_path / "streamed.yaml"
+
+    convert_csv_to_yaml(csv_path, expected_path)
+    stream_csv_to_yaml(csv_path, streamed_path)
+
+    assert streamed_path.read_text(encoding="utf-8") == expected_path.read_text(encoding="utf-8")
+
+
+def test_read_csv_header(tmp_path):
+    csv_path = write_csv(tmp_path, "records.csv")
+
+    assert read_csv_header(csv_path) == ["id", "name"]
+
+
 def test_derive_schema_path(tmp_path):
     yaml_path = tmp_path / "output.yaml"
     derived = derive_schema_path(yaml_path)
@@ -41,4 +89,16 @@ def test_build_schema_matches_fields():
 
     assert schema["items"]["required"] == fields
     assert set(schema["items"]["properties"].keys()) == set(fields)
-    assert schema["items"]["properties"]["id"]["type"] == "string"
\ No newline at end of file
+    assert schema["items"]["properties"]["id"]["type"] == "string"
+
+
+def test_write_schema_escapes_non_ascii_headers(tmp_path):
+    schema = build_schema(["id", "café"])
+    schema_path = tmp_path / "out" / "records.schema.json"
+
+    write_schema(schema, schema_path)
+
+    data = schema_path.read_bytes()
+    assert data == json.dumps(schema, indent=2).encode("utf-8")
+    assert b'"caf\\u00e9"' in data
+    assert json.loads(data) == schema
@@ -0,0 +1,200 @@
+from pathlib import Path
+
+import pytest
+
+import document_schema
+from document_schema import CACHE_ENV_VAR, SchemaParser
+
+SAMPLE_SCHEMA = Path(__file__).resolve().parent.parent / "examples" / "sample_schema.sql"
+
+
+@pytest.fixture(autouse=True)
+def no_parse_cache(monkeypatch):
+    monkeypatch.setenv(CACHE_ENV_VAR, "0")
+
+
+def test_parse_sample_schema_tables():
+    tables = SchemaParser(SAMPLE_SCHEMA).parse()
+
+    assert list(tables) == [
+        "users",
+        "categories",
+        "products",
+        "orders",
+        "order_items",
+        "reviews",
+        "addresses",
+        "inventory",
+        "discounts",
+    ]
+    users = tables["users"]
+    assert users.primary_key_columns == ["user_id"]
+    assert users.primary_key_set == frozenset({"user_id"})
+    assert users.full_name == "users"
+    assert users.comment == "User accounts table storing authentication and profile information"
+    username = users.columns[1]
+    assert (username.name, username.data_type, username.is_nullable) == ("username", "VARCHAR(50)", False)
+
+
+def test_parse_sample_schema_constraints_and_indexes():
+    tables = SchemaParser(SAMPLE_SCHEMA).parse()
+
+    fks = [(fk.constraint_name, fk.from_columns, fk.to_table) for fk in tables["order_items"].foreign_keys]
+    assert fks == [
+        ("fk_order_item_order", ["order_id"], "orders"),
+        ("fk_order_item_product", ["product_id"], "products"),
+    ]
+    assert tables["discounts"].check_constraints[0].name == "chk_discount_type"
+    assert tables["discounts"].check_constraints[0].expression == (
+        "discount_type IN ('percentage', 'fixed_amount')"
+    )
+    assert "idx_inventory_location_btree (warehouse_location) USING btree" in tables["inventory"].indexes
+
+
+def test_parse_columns_named_like_constraint_keywords(tmp_path):
+    sql_file = tmp_path / "schema.sql"
+    sql_file.write_text(
+        "CREATE TABLE payments (\n"
+        "    check_number INTEGER NOT NULL,\n"
+        "    unique_ref TEXT,\n"
+        "    CONSTRAINT payments_pkey PRIMARY KEY (check_number)\n"
+        ");\n",
+        encoding="utf-8",
+    )
+
+    table = SchemaParser(sql_file).parse()["payments"]
+
+    assert [col.name for col in table.columns] == ["check_number", "unique_ref"]
+    assert [col.is_unique for col in table.columns] == [False, False]
+    assert table.primary_key_columns == ["check_number"]
+
+
+def test_parse_reuses_cached_result(tmp_path, monkeypatch):
+    monkeypatch.delenv(CACHE_ENV_VAR)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    tables = SchemaParser(SAMPLE_SCHEMA).parse()
+
+    def fail():
+        raise AssertionError("schema was parsed again")
+
+    cached_parser = SchemaParser(SAMPLE_SCHEMA)
+    monkeypatch.setattr(cached_parser, "_parse_sql", fail)
+
+    assert cached_parser.parse() == tables
+    assert len(cached_parser.relationships) == sum(len(t.foreign_keys) for t in tables.values())
+    assert len(list((tmp_path / "cache" / "csv_to_yaml").glob("schema_*.pkl"))) == 1
+    assert cached_parser.sql_content == SAMPLE_SCHEMA.read_text(encoding="utf-8")
+
+
+def test_parse_cache_is_keyed_on_parser_source(tmp_path, monkeypatch):
+    monkeypatch.delenv(CACHE_ENV_VAR)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    SchemaParser(SAMPLE_SCHEMA).parse()
+
+    monkeypatch.setattr(document_schema, "_module_fingerprint", lambda: "edited")
+    reparsed = SchemaParser(SAMPLE_SCHEMA)
+    monkeypatch.setattr(reparsed, "_parse_sql", lambda: None)
+
+    assert reparsed.parse() == {}
+    assert len(list((tmp_path / "cache" / "csv_to_yaml").glob("schema_*.pkl"))) == 1
+
+
+def test_parse_cache_replaces_entry_of_edited_file(tmp_path, monkeypatch):
+    monkeypatch.delenv(CACHE_ENV_VAR)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    sql_file = tmp_path / "schema.sql"
+    sql_file.write_text("CREATE TABLE a (id integer);\n", encoding="utf-8")
+    assert list(SchemaParser(sql_file).parse()) == ["a"]
+
+    sql_file.write_text("CREATE TABLE b (id integer, name text);\n", encoding="utf-8")
+
+    assert list(SchemaParser(sql_file).parse()) == ["b"]
+    assert len(list((tmp_path / "cache" / "csv_to_yaml").glob("schema_*.pkl"))) == 1
+
+
+def test_comment_markers_inside_string_literals_are_kept(tmp_path):
+    sql_file = tmp_path / "schema.sql"
+    sql_file.write_text(
+        "CREATE TABLE notes (\n"
+        "    body TEXT DEFAULT 'a--b', -- trailing comment\n"
+        "    /* block\n       comment */ kind TEXT\n"
+        ");\n"
+        "COMMENT ON TABLE notes IS 'Uses /* and -- in text';\n",
+        encoding="utf-8",
+    )
+
+    table = SchemaParser(sql_file).parse()["notes"]
+
+    assert [(col.name, col.default_value) for col in table.columns] == [("body", "a--b"), ("kind", None)]
+    assert table.comment == "Uses /* and -- in text"
+
+
+def test_parallel_table_parsing_matches_serial():
+    serial = SchemaParser(SAMPLE_SCHEMA, jobs=1)
+    serial_tables = serial.parse()
+    parallel = SchemaParser(SAMPLE_SCHEMA, jobs=2)
+
+    assert parallel.parse() == serial_tables
+    assert parallel.relationships == serial.relationships
+
+
+def test_alter_table_foreign_keys_stay_within_their_statement(tmp_path):
+    sql_file = tmp_path / "schema.sql"
+    sql_file.write_text(
+        "CREATE TABLE accounts (id INTEGER PRIMARY KEY);\n"
+        "CREATE TABLE invoices (id INTEGER PRIMARY KEY, account_id INTEGER);\n"
+        "ALTER TABLE accounts ADD CONSTRAINT chk_id CHECK (id > 0);\n"
+        "ALTER TABLE ONLY invoices ADD CONSTRAINT fk_invoice_account\n"
+        "    FOREIGN KEY (account_id) REFERENCES accounts(id) ON DELETE CASCADE;\n",
+        encoding="utf-8",
+    )
+
+    parser = SchemaParser(sql_file)
+    tables = parser.parse()
+
+    assert tables["accounts"].foreign_keys == []
+    assert [(fk.from_table, fk.constraint_name, fk.to_table) for fk in parser.relationships] == [
+        ("invoices", "fk_invoice_account", "accounts"),
+    ]
+
+
+def test_ascii_diagram_handles_long_foreign_key_chains():
+    names = [f"t{i}" for i in range(3000)]
+    tables = {name: document_schema.Table(name=name, full_name=name) for name in names}
+    for parent, child in zip(names, names[1:]):
+        tables[child].foreign_keys.append(
+            document_schema.ForeignKey(
+                from_table=child, from_columns=["parent_id"], to_table=parent, to_columns=["id"], constraint_name=f"fk_{child}"
+            )
+        )
+
+    lines = document_schema._generate_ascii_relationship_diagram(tables)
+
+    assert lines[0] == "t0"
+    assert lines[-1].endswith("t2999 (parent_id → id)")
+
+
+def test_generate_documentation_returns_document_written_to_file(tmp_path):
+    tables = SchemaParser(SAMPLE_SCHEMA).parse()
+    output = tmp_path / "docs" / "schema.md"
+
+    doc = document_schema.generate_documentation(tables, output)
+
+    assert doc.startswith("# Database Schema Documentation\n")
+    assert output.read_text(encoding="utf-8") == doc
+    streamed = tmp_path / "streamed.md"
+    assert document_schema.write_documentation(tables, streamed) is None
+    assert streamed.read_text(encoding="utf-8") == doc
+
+
+def test_generate_confluence_documentation_returns_document_written_to_file(tmp_path):
+    tables = SchemaParser(SAMPLE_SCHEMA).parse()
+    output = tmp_path / "docs" / "schema.html"
+
+    doc = document_schema.generate_confluence_documentation(tables, output)
+
+    assert doc.endswith("</div>")
+    assert output.read_text(encoding="utf-8") == doc
+    streamed = tmp_path / "streamed.html"
+    assert document_schema.write_confluence_documentation(tables, streamed) is None
+    assert streamed.read_text(encoding="utf-8") == doc
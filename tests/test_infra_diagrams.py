@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+import infra_diagrams
+from infra_diagrams import CACHE_ENV_VAR, load_infra
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    monkeypatch.delenv(CACHE_ENV_VAR, raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    return tmp_path / "cache" / "csv_to_yaml"
+
+
+def cache_files(cache_home):
+    return list(cache_home.glob("infra_*.pkl"))
+
+
+def fail_parse(*args, **kwargs):
+    raise AssertionError("inventory was parsed again")
+
+
+def test_load_infra_reuses_cached_result(tmp_path, monkeypatch, cache_home):
+    input_yaml = tmp_path / "infra.yaml"
+    input_yaml.write_text("sites:\n  - name: dc1\n", encoding="utf-8")
+    data = load_infra(input_yaml)
+
+    monkeypatch.setattr(infra_diagrams.yaml, "load", fail_parse)
+
+    assert load_infra(input_yaml) == data == {"sites": [{"name": "dc1"}]}
+    assert len(cache_files(cache_home)) == 1
+
+
+def test_load_infra_replaces_entry_of_edited_file(tmp_path, cache_home):
+    input_yaml = tmp_path / "infra.yaml"
+    input_yaml.write_text("sites:\n  - name: dc1\n", encoding="utf-8")
+    load_infra(input_yaml)
+
+    input_yaml.write_text("sites:\n  - name: dc2\n", encoding="utf-8")
+    stamp = input_yaml.stat().st_mtime_ns + 1_000_000_000
+    os.utime(input_yaml, ns=(stamp, stamp))
+
+    assert load_infra(input_yaml) == {"sites": [{"name": "dc2"}]}
+    assert len(cache_files(cache_home)) == 1
+
+
+def test_load_infra_cache_can_be_disabled(tmp_path, monkeypatch, cache_home):
+    monkeypatch.setenv(CACHE_ENV_VAR, "0")
+    input_yaml = tmp_path / "infra.yaml"
+    input_yaml.write_text("sites: []\n", encoding="utf-8")
+
+    assert load_infra(input_yaml) == {"sites": []}
+    assert not cache_home.exists()
@@ -0,0 +1,108 @@
+import yaml
+
+from search_yaml import construct_scalar, key_may_occur, search_yaml_for_key_value
+
+DOCUMENT = """\
+- flag: yes
+  mode: 010
+  hex: 0x1F
+  big: 1_000
+  ratio: .5
+  code: !!str 3
+- on: &t true
+  copy: *t
+  plain: true
+- {name: web, port: 80}
+- ? name
+  : db
+- name: &n api
+  alias: *n
+"""
+
+
+def write_document(tmp_path):
+    yaml_path = tmp_path / "data.yaml"
+    yaml_path.write_text(DOCUMENT, encoding="utf-8")
+    return yaml_path
+
+
+def scalar_values(text):
+    return [construct_scalar(event) for event in yaml.parse(text) if isinstance(event, yaml.ScalarEvent)]
+
+
+def test_construct_scalar_uses_yaml_1_2_rules():
+    assert scalar_values("[yes, 010, 0x1F, 1_000, .5, '1', !!str 3, ~, 2024-01-02]") == [
+        "yes",
+        10,
+        31,
+        1000,
+        0.5,
+        "1",
+        "3",
+        None,
+        None,
+    ]
+    # Anchored booleans load as 0/1, unanchored ones as bool
+    assert scalar_values("[&a true, false]") == [1, False]
+    assert type(scalar_values("[&a true]")[0]) is int
+
+
+def test_search_matches_yaml_1_2_scalars(tmp_path):
+    yaml_path = write_document(tmp_path)
+
+    assert search_yaml_for_key_value(yaml_path, "flag", "yes") == (1, [1])
+    assert search_yaml_for_key_value(yaml_path, "flag", "True") == (0, [])
+    assert search_yaml_for_key_value(yaml_path, "mode", "10") == (1, [2])
+    assert search_yaml_for_key_value(yaml_path, "mode", "8") == (0, [])
+    assert search_yaml_for_key_value(yaml_path, "hex", "31") == (1, [3])
+    assert search_yaml_for_key_value(yaml_path, "big", "1000") == (1, [4])
+    assert search_yaml_for_key_value(yaml_path, "ratio", "0.5") == (1, [5])
+    assert search_yaml_for_key_value(yaml_path, "code", "3") == (1, [6])
+
+
+def test_search_anchored_booleans_and_aliases(tmp_path):
+    yaml_path = write_document(tmp_path)
+
+    assert search_yaml_for_key_value(yaml_path, "on", "1") == (1, [7])
+    assert search_yaml_for_key_value(yaml_path, "on", "True") == (0, [])
+    assert search_yaml_for_key_value(yaml_path, "copy", "1") == (1, [8])
+    assert search_yaml_for_key_value(yaml_path, "plain", "True") == (1, [9])
+    assert search_yaml_for_key_value(yaml_path, "alias", "api") == (1, [14])
+
+
+def test_search_flow_and_explicit_keys(tmp_path):
+    yaml_path = write_document(tmp_path)
+
+    assert search_yaml_for_key_value(yaml_path, "port", "80") == (1, [10])
+    assert search_yaml_for_key_value(yaml_path, "name", "web") == (1, [10])
+    assert search_yaml_for_key_value(yaml_path, "name", "db") == (1, [11])
+    assert search_yaml_for_key_value(yaml_path, "name", "api") == (1, [13])
+
+
+def test_key_may_occur():
+    assert key_may_occur("- name: web\n", "name")
+    assert not key_may_occur("- host: web\n", "name")
+    # Escapes may spell a key that is absent from the source text
+    assert key_may_occur('- "na\\u006de": web\n', "name")
+    # Keys that quote doubling or folding can produce are never ruled out
+    assert key_may_occur("- host: web\n", "it's")
+    assert key_may_occur("- host: web\n", "full name")
+
+
+def test_search_skips_documents_without_the_key(tmp_path):
+    yaml_path = tmp_path / "data.yaml"
+    # Malformed, but the key cannot occur, so nothing is parsed
+    yaml_path.write_text("- host: [web\n", encoding="utf-8")
+
+    assert search_yaml_for_key_value(yaml_path, "name", "web") == (0, [])
+
+
+def test_search_finds_escaped_and_quoted_flow_keys(tmp_path):
+    yaml_path = tmp_path / "data.yaml"
+    yaml_path.write_text(
+        '- "na\\u006de": web\n- {"name": db}\n- {\'name\': api}\n', encoding="utf-8"
+    )
+
+    assert search_yaml_for_key_value(yaml_path, "name", "web") == (1, [1])
+    assert search_yaml_for_key_value(yaml_path, "name", "db") == (1, [2])
+    assert search_yaml_for_key_value(yaml_path, "name", "api") == (1, [3])
@@ -2,10 +2,19 @@ import json
 
 import pytest
 
-from jsonschema import ValidationError
+from jsonschema import SchemaError, ValidationError
 
-from main import build_schema, convert_csv_to_yaml
-from validate import validate_yaml
+from main import build_schema, convert_csv_to_yaml, stream_csv_to_yaml
+import validate
+from validate import (
+    collect_all_validation_errors,
+    find_line_for_path,
+    find_lines_for_paths,
+    format_validation_error,
+    inline_refs,
+    main as validate_main,
+    validate_yaml,
+)
 
 
 def test_validate_yaml_success(tmp_path):
@@ -35,4 +44,151 @@ def test_validate_yaml_failure(tmp_path):
     invalid_yaml.write_text("- {id: 2}", encoding="utf-8")
 
     with pytest.raises(ValidationError):
-        validate_yaml(invalid_yaml, schema_path)
\ No newline at end of file
+        validate_yaml(invalid_yaml, schema_path)
+
+
+def test_validate_yaml_with_inferred_types(tmp_path):
+    csv_path = tmp_path / "records.csv"
+    csv_path.write_text("id,price,code\n1,9.50,007\n2,3,A1\n", encoding="utf-8")
+    yaml_path = tmp_path / "records.yaml"
+    schema_path = tmp_path / "records.schema.json"
+
+    column_types = {}
+    row_count, headers = stream_csv_to_yaml(csv_path, yaml_path, column_types)
+    schema = build_schema(headers, column_types)
+    schema_path.write_text(json.dumps(schema), encoding="utf-8")
+
+    assert row_count == 2
+    assert {name: prop["type"] for name, prop in schema["items"]["properties"].items()} == {
+        "id": "integer",
+        "price": "number",
+        "code": "string",
+    }
+    assert yaml_path.read_text(encoding="utf-8") == (
+        "- id: 1\n  price: 9.5\n  code: '007'\n- id: 2\n  price: 3\n  code: A1\n"
+    )
+    validate_yaml(yaml_path, schema_path)
+
+
+def test_validate_yaml_picks_up_edited_schema(tmp_path):
+    yaml_path = tmp_path / "records.yaml"
+    yaml_path.write_text("- {id: '1'}\n", encoding="utf-8")
+    schema_path = tmp_path / "records.schema.json"
+    schema_path.write_text(json.dumps(build_schema(["id"])), encoding="utf-8")
+
+    validate_yaml(yaml_path, schema_path)
+
+    schema_path.write_text(json.dumps(build_schema(["id", "name"])), encoding="utf-8")
+    with pytest.raises(ValidationError):
+        validate_yaml(yaml_path, schema_path)
+
+
+def test_validate_yaml_rejects_invalid_schema(tmp_path):
+    yaml_path = tmp_path / "records.yaml"
+    yaml_path.write_text("- {id: '1'}\n", encoding="utf-8")
+    schema_path = tmp_path / "records.schema.json"
+    schema_path.write_text(json.dumps({"type": "array", "minItems": "one"}), encoding="utf-8")
+
+    with pytest.raises(SchemaError):
+        validate_yaml(yaml_path, schema_path)
+
+
+def test_validate_yaml_streams_records(tmp_path):
+    yaml_path = tmp_path / "records.yaml"
+    yaml_path.write_text("- {id: '1'}\n- {id: 2}\n- {id: [unclosed\n", encoding="utf-8")
+    schema_path = tmp_path / "records.schema.json"
+    schema_path.write_text(json.dumps(build_schema(["id"])), encoding="utf-8")
+
+    # The first invalid record is reported without parsing the rest of the file
+    with pytest.raises(ValidationError) as excinfo:
+        validate_yaml(yaml_path, schema_path)
+
+    assert list(excinfo.value.absolute_path) == [1, "id"]
+    assert list(excinfo.value.schema_path) == ["items", "properties", "id", "type"]
+
+
+def test_validate_yaml_with_local_refs(tmp_path):
+    yaml_path = tmp_path / "records.yaml"
+    yaml_path.write_text("- {id: '1', parent: {id: 2}}\n", encoding="utf-8")
+    schema_path = tmp_path / "records.schema.json"
+    schema = {
+        "type": "array",
+        "items": {"$ref": "#/$defs/record"},
+        "$defs": {
+            "id": {"type": "string"},
+            "record": {
+                "type": "object",
+                "properties": {"id": {"$ref": "#/$defs/id"}, "parent": {"$ref": "#/$defs/record"}},
+            },
+        },
+    }
+    schema_path.write_text(json.dumps(schema), encoding="utf-8")
+
+    assert inline_refs(schema)["items"]["properties"]["id"] == {"type": "string"}
+    assert inline_refs(schema)["items"]["properties"]["parent"] == {"$ref": "#/$defs/record"}
+    with pytest.raises(ValidationError) as excinfo:
+        validate_yaml(yaml_path, schema_path)
+
+    assert list(excinfo.value.absolute_path) == [0, "parent", "id"]
+    assert excinfo.value.message == "2 is not of type 'string'"
+
+
+def test_format_validation_error_finds_line_in_edited_file(tmp_path):
+    yaml_path = tmp_path / "records.yaml"
+    yaml_path.write_text("- {id: '1'}\n- {id: 2}\n", encoding="utf-8")
+    schema_path = tmp_path / "records.schema.json"
+    schema_path.write_text(json.dumps(build_schema(["id"])), encoding="utf-8")
+
+    [error] = collect_all_validation_errors(yaml_path, schema_path)
+    assert format_validation_error(error, yaml_path) == (
+        "Validation failed at [1].id (line 2): 2 is not of type 'string'"
+    )
+
+    yaml_path.write_text("- {id: '1'}\n\n- {id: 2}\n", encoding="utf-8")
+    [error] = collect_all_validation_errors(yaml_path, schema_path)
+    assert format_validation_error(error, yaml_path).startswith("Validation failed at [1].id (line 3)")
+    # None from find_lines_for_paths means no line, not "look it up again"
+    assert format_validation_error(error, yaml_path, None) == (
+        "Validation failed at [1].id: 2 is not of type 'string'"
+    )
+
+
+def test_find_lines_for_paths_with_repeated_keys(tmp_path):
+    yaml_path = tmp_path / "records.yaml"
+    yaml_path.write_text(
+        "- name: a\n  name: b\n- name: c\n- name: d\n- 1:\n    - x\n  true:\n    - y\n", encoding="utf-8"
+    )
+
+    # A repeated key replaces the earlier entry, as it does in load_yaml
+    assert find_lines_for_paths(yaml_path, [[0, "name"], [1, "name"], [2, "name"], [3, 1, 0]]) == [
+        2,
+        3,
+        4,
+        8,
+    ]
+    assert [find_line_for_path(yaml_path, path) for path in ([0, "name"], [3, 1, 0])] == [2, 8]
+
+
+def test_main_reports_invalid_schema(tmp_path, monkeypatch, capsys):
+    yaml_path = tmp_path / "records.yaml"
+    yaml_path.write_text("- {id: '1'}\n", encoding="utf-8")
+    schema_path = tmp_path / "records.schema.json"
+    schema_path.write_text(json.dumps({"type": "array", "items": {"type": 1}}), encoding="utf-8")
+    monkeypatch.setattr("sys.argv", ["validate.py", str(yaml_path), str(schema_path)])
+
+    with pytest.raises(SystemExit) as excinfo:
+        validate_main()
+
+    assert excinfo.value.code == 1
+    assert capsys.readouterr().err.startswith("Invalid schema: 1 is not valid under any of the given schemas")
+
+
+def test_find_line_for_path_keeps_only_the_latest_tree(tmp_path):
+    first = tmp_path / "first.yaml"
+    first.write_text("- id: '1'\n", encoding="utf-8")
+    second = tmp_path / "second.yaml"
+    second.write_text("- {}\n- id: '2'\n", encoding="utf-8")
+
+    assert find_line_for_path(first, [0, "id"]) == 1
+    assert find_line_for_path(second, [1, "id"]) == 2
+    assert validate._composed_yaml.cache_info().currsize == 1
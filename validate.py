@@ -5,12 +5,32 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import unquote
 
 import yaml
-from jsonschema import Draft202012Validator, ValidationError
-from ruamel.yaml import YAML
-from ruamel.yaml.comments import CommentedMap, CommentedSeq
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml bindings not available
+    from yaml import SafeLoader
+
+from jsonschema import Draft202012Validator, SchemaError, ValidationError
+from yaml.composer import Composer, ComposerError
+from yaml.constructor import SafeConstructor
+from yaml.events import (
+    AliasEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    NodeEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+)
+from yaml.nodes import MappingNode, ScalarNode, SequenceNode
+from yaml.resolver import Resolver
 
 
 def parse_args() -> argparse.Namespace:
@@ -34,100 +54,313 @@ def load_yaml(path: Path):
     if not path.is_file():
         raise FileNotFoundError(f"YAML file not found: {path}")
     with path.open(encoding="utf-8") as fh:
-        return yaml.safe_load(fh)
+        return yaml.load(fh, Loader=SafeLoader)
 
 
-def load_yaml_with_positions(path: Path):
-    """Load YAML file with position information preserved."""
-    if not path.is_file():
-        raise FileNotFoundError(f"YAML file not found: {path}")
-    yaml_loader = YAML()
-    with path.open(encoding="utf-8") as fh:
-        return yaml_loader.load(fh)
+if issubclass(SafeLoader, Composer):
+    _RecordLoader = SafeLoader
+else:
+    class _RecordLoader(SafeLoader, Composer):
+        """The libyaml loader with PyYAML's composer, to compose one node at a time."""
 
+        def __init__(self, stream) -> None:
+            super().__init__(stream)
+            Composer.__init__(self)
 
-def get_line_number_for_path(yaml_data_with_positions, path: list) -> int | None:
-    """Get the line number for a given JSON path in the YAML file.
-    
-    Args:
-        yaml_data_with_positions: YAML data loaded with ruamel.yaml (preserves positions)
-        path: JSON path as a list (e.g., [0, 'name'] for first item's 'name' field)
-    
-    Returns:
-        Line number (1-indexed) or None if not found
-    """
-    if not path:
+
+# Schema keywords that never produce errors on an array instance, so an
+# array schema made of these and items validates each item on its own
+_ARRAY_ANNOTATIONS = frozenset({
+    "$schema", "$id", "$anchor", "$comment", "$defs", "definitions",
+    "title", "description", "default", "examples", "deprecated", "readOnly", "writeOnly",
+})
+
+
+def _record_schema(schema) -> dict | None:
+    """Return the items schema if schema only checks the items of an array."""
+    if not isinstance(schema, dict) or schema.get("type") != "array":
+        return None
+    items = schema.get("items")
+    if not isinstance(items, dict):
+        return None
+    if any(key not in _ARRAY_ANNOTATIONS for key in schema if key not in ("type", "items")):
         return None
+    return items
+
+
+_STR_TAG = "tag:yaml.org,2002:str"
+# The parser emits these exact event classes, so events are told apart by
+# type identity rather than isinstance chains
+_COLLECTION_START = frozenset((MappingStartEvent, SequenceStartEvent))
+_COLLECTION_END = frozenset((MappingEndEvent, SequenceEndEvent))
+_resolver = Resolver()
+_constructor = SafeConstructor()
+_NO_KEY = object()
+# Trie entry listing the paths that end at a node; None is a valid YAML key
+_PATH_ENDS = object()
+
+
+class _AliasOnPath(Exception):
+    """Raised when a looked-up path continues through an alias."""
+
+
+class _AllFound(Exception):
+    """Raised once every looked-up path has been found."""
+
+
+def _scalar_key(tag: str | None, value: str, implicit) -> object:
+    """Construct a scalar mapping key the way load_yaml does, or _NO_KEY if it cannot be.
     
+    Constructors fail on malformed values in several ways, e.g. KeyError for
+    "!!bool 1" and IndexError for "!!int ''", so those are all caught here.
+    """
+    if tag is None or tag == "!":
+        tag = _resolver.resolve(ScalarNode, value, implicit)
+    if tag == _STR_TAG:
+        return value
+    construct = SafeConstructor.yaml_constructors.get(tag)
+    if construct is None:
+        return _NO_KEY
     try:
-        # Navigate to the parent of the target location
-        current = yaml_data_with_positions
-        parent = None
-        key = None
-        
-        for i, path_key in enumerate(path):
-            parent = current
-            key = path_key
-            
-            if isinstance(current, (CommentedSeq, list)):
-                if isinstance(path_key, int) and 0 <= path_key < len(current):
-                    current = current[path_key]
-                else:
-                    return None
-            elif isinstance(current, (CommentedMap, dict)):
-                if path_key in current:
-                    current = current[path_key]
+        return construct(_constructor, ScalarNode(tag, value))
+    except (yaml.YAMLError, ValueError, TypeError, LookupError, AttributeError):
+        return _NO_KEY
+
+
+def _skip_node(events, event) -> None:
+    """Consume the remaining events of the node that starts with event."""
+    if type(event) in _COLLECTION_START:
+        depth = 1
+        while depth:
+            event_type = type(next(events))
+            if event_type in _COLLECTION_START:
+                depth += 1
+            elif event_type in _COLLECTION_END:
+                depth -= 1
+
+
+def _path_ends(trie: dict) -> list[int]:
+    """List the indexes of the paths that end at or below trie."""
+    ends = list(trie.get(_PATH_ENDS, ()))
+    for key, sub in trie.items():
+        if key is not _PATH_ENDS:
+            ends += _path_ends(sub)
+    return ends
+
+
+def _settle(found: list[int], unfound: list) -> None:
+    unfound[0] -= len(found)
+    if not unfound[0]:
+        raise _AllFound
+
+
+def _walk_events(events, event, trie: dict, lines: list, unfound: list, settled: bool) -> list[int]:
+    """Fill in lines for the paths in trie below the node that starts with event.
+    
+    trie maps path keys to sub-tries; the _PATH_ENDS entry of a sub-trie lists
+    the indexes of the paths that end there. unfound holds the number of paths
+    whose line is not final yet. Branches no path goes through are skipped
+    without being constructed.
+    
+    As in load_yaml, a repeated mapping key replaces the earlier entry, so a
+    line found below a mapping is only final once the mapping has ended.
+    settled says whether the node itself can no longer be replaced; the
+    indexes of found paths that are not final yet are returned for the caller
+    to settle.
+    """
+    event_type = type(event)
+    if event_type is AliasEvent:
+        raise _AliasOnPath
+    if event_type is SequenceStartEvent:
+        pending = []
+        index = 0
+        remaining = sum(1 for key in trie if key is not _PATH_ENDS)
+        for child in events:
+            child_type = type(child)
+            if child_type is SequenceEndEvent:
+                return pending
+            sub = trie.get(index) if remaining else None
+            if sub is None:
+                _skip_node(events, child)
+            else:
+                remaining -= 1
+                if child_type is AliasEvent:
+                    # An alias item starts where its anchored node does
+                    raise _AliasOnPath
+                ends = sub.get(_PATH_ENDS, [])
+                for path_index in ends:
+                    lines[path_index] = child.start_mark.line + 1
+                found = ends + _walk_events(events, child, sub, lines, unfound, settled)
+                if settled:
+                    _settle(found, unfound)
                 else:
-                    return None
+                    pending += found
+            index += 1
+    elif event_type is MappingStartEvent:
+        found_by_sub: dict[int, list[int]] = {}
+        for key_event in events:
+            key_type = type(key_event)
+            if key_type is MappingEndEvent:
+                pending = [path_index for found in found_by_sub.values() for path_index in found]
+                if settled:
+                    _settle(pending, unfound)
+                    return []
+                return pending
+            if key_type is AliasEvent:
+                raise _AliasOnPath
+            key = _NO_KEY
+            if key_type is ScalarEvent:
+                key = _scalar_key(key_event.tag, key_event.value, key_event.implicit)
+            else:
+                _skip_node(events, key_event)
+            value_event = next(events)
+            # Scalar keys construct to hashable values, so no guard is needed
+            sub = trie.get(key)
+            if sub is None:
+                _skip_node(events, value_event)
+                continue
+            if isinstance(key, str):
+                line = key_event.start_mark.line + 1
+            elif type(value_event) in _COLLECTION_START:
+                # Other keys report the line their collection value starts on
+                line = value_event.start_mark.line + 1
+            else:
+                line = None
+            descend = len(sub) > (_PATH_ENDS in sub)
+            if type(value_event) is AliasEvent and (descend or line is None and not isinstance(key, str)):
+                raise _AliasOnPath
+            if id(sub) in found_by_sub:
+                # A repeated key, or one equal to an earlier key such as 1 and
+                # true, replaces everything found under the earlier entry
+                for path_index in _path_ends(sub):
+                    lines[path_index] = None
+            ends = sub.get(_PATH_ENDS, [])
+            for path_index in ends:
+                lines[path_index] = line
+            if descend:
+                found_by_sub[id(sub)] = ends + _walk_events(events, value_event, sub, lines, unfound, False)
             else:
+                _skip_node(events, value_event)
+                found_by_sub[id(sub)] = list(ends)
+    # Scalars have no children, so any paths continuing below them are not found
+    return []
+
+
+def _mapping_entries(node: MappingNode, entries_by_node: dict) -> dict:
+    """Index a mapping node's entries by constructed key.
+    
+    Of equal keys the last one wins, as it does in the data load_yaml builds.
+    """
+    entries = entries_by_node.get(id(node))
+    if entries is None:
+        entries = {}
+        for key_node, value_node in node.value:
+            if type(key_node) is ScalarNode:
+                key = _scalar_key(key_node.tag, key_node.value, (False, False))
+                if key is not _NO_KEY:
+                    entries[key] = (key_node, value_node)
+        entries_by_node[id(node)] = entries
+    return entries
+
+
+def _walk_nodes(node, path: list, entries_by_node: dict) -> int | None:
+    """Look up one path in a composed node graph, where aliases are shared nodes.
+    
+    entries_by_node holds the _mapping_entries of the mappings visited so far
+    and must only be shared between walks of the same graph.
+    """
+    line = None
+    for key in path:
+        node_type = type(node)
+        if node_type is SequenceNode:
+            if not isinstance(key, int) or not 0 <= key < len(node.value):
+                return None
+            node = node.value[key]
+            line = node.start_mark.line + 1
+        elif node_type is MappingNode:
+            entry = _mapping_entries(node, entries_by_node).get(key)
+            if entry is None:
                 return None
-        
-        # If we have a parent that's a CommentedMap and a key, get the line number of that key
-        if isinstance(parent, CommentedMap) and isinstance(key, str) and key in parent:
-            if hasattr(parent, 'lc') and parent.lc:
-                try:
-                    # Try to get the key line first, fall back to value line
-                    key_pos = parent.lc.key(key)
-                    if key_pos:
-                        return key_pos[0] + 1  # ruamel.yaml uses 0-indexed, convert to 1-indexed
-                    value_pos = parent.lc.value(key)
-                    if value_pos:
-                        return value_pos[0] + 1
-                except (AttributeError, IndexError, TypeError):
-                    pass
-        
-        # If we're at an array element, try to get the line number of that element
-        if isinstance(parent, CommentedSeq) and isinstance(key, int) and 0 <= key < len(parent):
-            if hasattr(parent, 'lc') and parent.lc:
-                try:
-                    # For list items, we can get the line number of the item itself
-                    item_line = parent.lc.item(key)[0] + 1 if hasattr(parent.lc, 'item') else None
-                    if item_line:
-                        return item_line
-                except (AttributeError, IndexError, TypeError):
-                    pass
-            
-            # Fallback: try to get line number from the element itself if it has lc
-            element = parent[key]
-            if isinstance(element, (CommentedMap, CommentedSeq)):
-                if hasattr(element, 'lc') and element.lc:
-                    try:
-                        return element.lc.line + 1
-                    except (AttributeError, TypeError):
-                        pass
-        
-        # Final fallback: try to get line number from current element
-        if isinstance(current, (CommentedMap, CommentedSeq)):
-            if hasattr(current, 'lc') and current.lc:
-                try:
-                    return current.lc.line + 1
-                except (AttributeError, TypeError):
-                    pass
-    except Exception:
-        # If anything goes wrong, return None
-        pass
-    
-    return None
+            key_node, node = entry
+            if isinstance(key, str):
+                line = key_node.start_mark.line + 1
+            elif type(node) in (MappingNode, SequenceNode):
+                line = node.start_mark.line + 1
+            else:
+                line = None
+        else:
+            return None
+    return line
+
+
+def find_lines_for_paths(yaml_file: Path, paths: list[list]) -> list[int | None]:
+    """Find the line of each JSON path (e.g. [0, 'name']) in a YAML file.
+    
+    A mapping entry is reported at its key, a sequence item where it starts.
+    The file is read as an event stream in a single pass that only descends
+    into branches on one of the paths and stops once all are found and can
+    no longer be replaced by a repeated key; a path through an alias falls
+    back to composing the whole document.
+    
+    Returns:
+        Line numbers (1-indexed) in the order of paths, None where not found
+    """
+    lines: list[int | None] = [None] * len(paths)
+    trie: dict = {}
+    for index, path in enumerate(paths):
+        if not path:
+            continue
+        sub = trie
+        for key in path:
+            sub = sub.setdefault(key, {})
+        sub.setdefault(_PATH_ENDS, []).append(index)
+    if not trie:
+        return lines
+    
+    if not yaml_file.is_file():
+        raise FileNotFoundError(f"YAML file not found: {yaml_file}")
+    with yaml_file.open(encoding="utf-8") as fh:
+        events = yaml.parse(fh, Loader=SafeLoader)
+        try:
+            for event in events:
+                if isinstance(event, NodeEvent):
+                    _walk_events(events, event, trie, lines, [sum(1 for path in paths if path)], True)
+                    break
+            return lines
+        except _AllFound:
+            return lines
+        except _AliasOnPath:
+            pass
+    
+    with yaml_file.open(encoding="utf-8") as fh:
+        root = yaml.compose(fh, Loader=SafeLoader)
+    entries_by_node: dict = {}
+    return [_walk_nodes(root, path, entries_by_node) if path else None for path in paths]
+
+
+@lru_cache(maxsize=1)
+def _composed_yaml(yaml_path: str, mtime_ns: int, size: int) -> tuple:
+    # mtime_ns and size are part of the key so an edited file is composed again.
+    # A node tree is many times the size of its file, so only the latest is kept
+    with Path(yaml_path).open(encoding="utf-8") as fh:
+        return yaml.compose(fh, Loader=SafeLoader), {}
+
+
+def find_line_for_path(yaml_file: Path, path: list) -> int | None:
+    """Find the line of one JSON path in a YAML file; see find_lines_for_paths.
+    
+    The node tree of the file looked up last is kept while the file is
+    unchanged, so looking up the errors of one file one at a time composes
+    it only once. Looking up another file replaces it; find_lines_for_paths
+    streams and keeps nothing.
+    """
+    if not path:
+        return None
+    if not yaml_file.is_file():
+        raise FileNotFoundError(f"YAML file not found: {yaml_file}")
+    stat = yaml_file.stat()
+    root, entries_by_node = _composed_yaml(str(yaml_file.resolve()), stat.st_mtime_ns, stat.st_size)
+    return _walk_nodes(root, path, entries_by_node)
 
 
 def format_path(path: list) -> str:
@@ -151,15 +384,177 @@ def format_path(path: list) -> str:
 def load_schema(path: Path) -> dict:
     if not path.is_file():
         raise FileNotFoundError(f"Schema file not found: {path}")
-    with path.open(encoding="utf-8") as fh:
-        return json.load(fh)
+    return json.loads(path.read_bytes())
+
+
+# Keywords whose value is a subschema, a map of subschemas or a list of them.
+# not and oneOf are left out since their error messages quote their subschemas
+_SUBSCHEMA_KEYWORDS = frozenset({
+    "items", "additionalItems", "additionalProperties", "contains", "propertyNames",
+    "if", "then", "else",
+})
+_SUBSCHEMA_MAP_KEYWORDS = frozenset({"properties", "patternProperties", "dependentSchemas"})
+_SUBSCHEMA_LIST_KEYWORDS = frozenset({"allOf", "anyOf", "prefixItems"})
+# Keywords under which a $ref's meaning depends on more than the schema it points at
+_DYNAMIC_KEYWORDS = frozenset({
+    "$id", "$dynamicRef", "$dynamicAnchor", "$recursiveRef", "$recursiveAnchor",
+    "unevaluatedItems", "unevaluatedProperties",
+})
+_NO_TARGET = object()
+# Default line_num of format_validation_error; None means no line was found
+_UNSET = object()
+
+
+def _has_dynamic_keywords(value, is_root: bool = False) -> bool:
+    if isinstance(value, dict):
+        return any(
+            (key in _DYNAMIC_KEYWORDS and not (is_root and key == "$id")) or _has_dynamic_keywords(sub)
+            for key, sub in value.items()
+        )
+    if isinstance(value, list):
+        return any(_has_dynamic_keywords(sub) for sub in value)
+    return False
+
+
+def _pointer_target(root: dict, ref: str) -> object:
+    """Resolve a "#/..." JSON pointer ref within root, or _NO_TARGET."""
+    target = root
+    for part in ref[2:].split("/"):
+        part = unquote(part).replace("~1", "/").replace("~0", "~")
+        if isinstance(target, dict) and part in target:
+            target = target[part]
+        elif isinstance(target, list) and part.isdigit() and int(part) < len(target):
+            target = target[int(part)]
+        else:
+            return _NO_TARGET
+    return target
+
+
+def inline_refs(schema):
+    """Return schema with its local "$ref"s to object schemas replaced by their targets.
+    
+    Only subschemas that consist of a single "#/..." $ref are replaced, which
+    validates with the same error messages and paths as following the ref,
+    without resolving it again for every instance. Refs that are cyclic, point at
+    boolean schemas or sit next to other keywords are kept as they are, and
+    so are $defs, so the refs that remain still resolve. Schemas using $id
+    below the root, dynamic refs or unevaluated* keywords are returned
+    unchanged.
+    """
+    if not isinstance(schema, dict) or _has_dynamic_keywords(schema, is_root=True):
+        return schema
+    inlined: dict[str, object] = {}
+    
+    def inline(node, expanding: frozenset):
+        if not isinstance(node, dict):
+            return node
+        ref = node.get("$ref")
+        if len(node) == 1 and isinstance(ref, str) and ref.startswith("#/"):
+            if ref in inlined:
+                return inlined[ref]
+            target = _pointer_target(schema, ref)
+            if ref in expanding or not isinstance(target, dict):
+                return node
+            # A ref's expansion is the same wherever it appears, so share it
+            inlined[ref] = result = inline(target, expanding | {ref})
+            return result
+        return inline_keywords(node, expanding)
+    
+    def inline_keywords(node: dict, expanding: frozenset) -> dict:
+        result = {}
+        for key, value in node.items():
+            if key in _SUBSCHEMA_KEYWORDS:
+                if isinstance(value, list):
+                    value = [inline(sub, expanding) for sub in value]
+                else:
+                    value = inline(value, expanding)
+            elif key in _SUBSCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+                value = {name: inline(sub, expanding) for name, sub in value.items()}
+            elif key in _SUBSCHEMA_LIST_KEYWORDS and isinstance(value, list):
+                value = [inline(sub, expanding) for sub in value]
+            result[key] = value
+        return result
+    
+    return inline_keywords(schema, frozenset())
+
+
+@lru_cache(maxsize=128)
+def _cached_validator(schema_path: str, mtime_ns: int, size: int) -> Draft202012Validator:
+    # mtime_ns and size are part of the key so an edited schema is reloaded
+    schema = load_schema(Path(schema_path))
+    # Check the schema itself once per version rather than never; a broken
+    # schema raises SchemaError here instead of odd errors during validation
+    Draft202012Validator.check_schema(schema)
+    return Draft202012Validator(inline_refs(schema))
+
+
+def get_validator(schema_file: Path) -> Draft202012Validator:
+    """Return a validator for a schema file, reused while the file is unchanged."""
+    if not schema_file.is_file():
+        raise FileNotFoundError(f"Schema file not found: {schema_file}")
+    stat = schema_file.stat()
+    return _cached_validator(str(schema_file.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+def iter_validation_errors(yaml_file: Path, schema_file: Path):
+    """Yield the errors of validating a YAML file, in iter_errors order.
+    
+    For schemas that only check the items of a top-level array, such as the
+    ones build_schema writes, the document's sequence is composed and
+    validated one record at a time. Only the current record is held in
+    memory, and a caller that stops early never parses the rest of the file.
+    Other schemas and documents are loaded whole.
+    """
+    if not yaml_file.is_file():
+        raise FileNotFoundError(f"YAML file not found: {yaml_file}")
+    validator = get_validator(schema_file)
+    items_schema = _record_schema(validator.schema)
+    if items_schema is None:
+        yield from validator.iter_errors(load_yaml(yaml_file))
+        return
+    
+    with yaml_file.open(encoding="utf-8") as fh:
+        loader = _RecordLoader(fh)
+        try:
+            loader.get_event()  # StreamStartEvent
+            if loader.check_event(StreamEndEvent):
+                yield from validator.iter_errors(None)
+                return
+            document = loader.get_event()
+            start = loader.peek_event()
+            if type(start) is SequenceStartEvent and start.anchor is None and start.tag is None:
+                loader.get_event()
+                index = 0
+                while not loader.check_event(SequenceEndEvent):
+                    record = loader.construct_document(loader.compose_node(None, None))
+                    yield from validator.descend(record, items_schema, path=index, schema_path="items")
+                    index += 1
+                loader.get_event()
+                root = None
+            else:
+                root = loader.compose_node(None, None)
+            loader.get_event()  # DocumentEndEvent
+            if not loader.check_event(StreamEndEvent):
+                raise ComposerError(
+                    "expected a single document in the stream",
+                    document.start_mark,
+                    "but found another document",
+                    loader.get_event().start_mark,
+                )
+            if root is not None:
+                yield from validator.iter_errors(loader.construct_document(root))
+        finally:
+            loader.dispose()
 
 
 def validate_yaml(yaml_file: Path, schema_file: Path) -> None:
-    data = load_yaml(yaml_file)
-    schema = load_schema(schema_file)
-    validator = Draft202012Validator(schema)
-    validator.validate(data)
+    errors = iter_validation_errors(yaml_file, schema_file)
+    try:
+        error = next(errors, None)
+    finally:
+        errors.close()
+    if error is not None:
+        raise error
 
 
 def collect_all_validation_errors(yaml_file: Path, schema_file: Path) -> list[ValidationError]:
@@ -168,20 +563,21 @@ def collect_all_validation_errors(yaml_file: Path, schema_file: Path) -> list[Va
     Returns:
         List of ValidationError objects. Empty list if validation passes.
     """
-    data = load_yaml(yaml_file)
-    schema = load_schema(schema_file)
-    validator = Draft202012Validator(schema)
-    return list(validator.iter_errors(data))
+    return list(iter_validation_errors(yaml_file, schema_file))
 
 
-def format_validation_error(error: ValidationError, yaml_file: Path) -> str:
-    """Format a ValidationError with path and line number information."""
-    # Load YAML with positions for line number tracking
-    yaml_data_with_positions = load_yaml_with_positions(yaml_file)
+def format_validation_error(error: ValidationError, yaml_file: Path, line_num: int | None = _UNSET) -> str:
+    """Format a ValidationError with path and line number information.
     
+    line_num is the line of the error's path as returned by find_lines_for_paths,
+    which finds the lines of many errors in one pass; None there means the path
+    has no line and is not looked up again. Without it the line is looked up in
+    yaml_file.
+    """
     path = list(error.absolute_path) if error.absolute_path else []
     path_str = format_path(path)
-    line_num = get_line_number_for_path(yaml_data_with_positions, path)
+    if line_num is _UNSET:
+        line_num = find_line_for_path(yaml_file, path)
     
     error_msg = f"Validation failed at {path_str}"
     if line_num is not None:
@@ -193,12 +589,17 @@ def format_validation_error(error: ValidationError, yaml_file: Path) -> str:
 
 def main() -> None:
     args = parse_args()
-    errors = collect_all_validation_errors(args.yaml_file, args.schema_file)
+    try:
+        errors = collect_all_validation_errors(args.yaml_file, args.schema_file)
+    except SchemaError as e:
+        print(f"Invalid schema: {e.message}", file=sys.stderr)
+        sys.exit(1)
     
     if errors:
         print(f"Validation failed with {len(errors)} error(s):", file=sys.stderr)
-        for i, error in enumerate(errors, 1):
-            error_msg = format_validation_error(error, args.yaml_file)
+        line_numbers = find_lines_for_paths(args.yaml_file, [list(error.absolute_path) for error in errors])
+        for i, (error, line_num) in enumerate(zip(errors, line_numbers), 1):
+            error_msg = format_validation_error(error, args.yaml_file, line_num)
             print(f"  {i}. {error_msg}", file=sys.stderr)
         sys.exit(1)
     